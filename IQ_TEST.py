@@ -1,212 +1,261 @@
 import streamlit as st
 from utils import (
-    QUESTIONS,
-    DEFAULT_OPTIONS,
+    get_question_bank,
+    get_norm_table,
+    start_rerun_timer,
+    get_item_pools,
+    get_adaptive_session,
+    reset_adaptive_session,
+    adaptive_next_item,
     init_session_state,
-    typing_print_lines,
-    calculate_scores,
+    checkpoint_session,
+    typing_print_html,
+    render_answer_widgets,
+    answer_from_selection,
+    record_answer,
+    commit_section,
+    finish_test,
+    session_question,
     generate_certificate_bytes,
+    get_email_queue,
+    email_certificate,
 )
 import io
 
 st.set_page_config(page_title="Streamlit IQ Test App", layout="centered")
 
+#Question bank shared by every session in this process
+bank = get_question_bank()
+questions = bank.questions
+#Generated-item pools are built once per process, never per session
+get_item_pools()
+#Norm tables are loaded here, not on the first submit; new results are read in the background
+get_norm_table()
+
 #Initialize session state
-init_session_state()
+session = init_session_state(len(questions))
 
 PAGES = ["Introduction", "Register", "Test", "Results"]
 page = st.sidebar.selectbox("Navigate", PAGES)
+st.sidebar.checkbox(
+    "Section mode",
+    key="section_mode",
+    help="Answer all questions of a category on one page and submit them together.",
+)
+st.sidebar.checkbox(
+    "Adaptive mode",
+    key="adaptive_mode",
+    on_change=reset_adaptive_session,
+    help="Pick each next question from your answers so far and stop once every category is measured precisely enough.",
+)
 
-#Page 1 (Introduction)
-if page == "Introduction":
-    st.title("Streamlit IQ Test App")
-    st.markdown(
-        "This app measures five aspects of intelligence: **Analytical**, **Social**, **Moral**, **Symbolic**, and **Creative-Technical**.\n\n"
-        "You'll register your details, answer a short set of questions and receive a results summary and downloadable certificate."
-    )
-    st.markdown("---")
-    st.write("**How it works**")
-    st.write(
-        "You will see one question per page. Use the `Back` and `Next` buttons to move. Your progress is saved in the session so you can come back to where you left off."
-    )
-    st.write(
-        "The test includes questions that target: Analytical, Social, Moral, Symbolic, and Creative-Technical intelligence."
-    )
-    st.info("When you're ready, go to 'Register' in the sidebar to begin.")
-
-#Page 2 (Registration)
-elif page == "Register":
-    st.header("User Registration")
-    with st.form("reg_form"):
-        name = st.text_input("Full name", value=st.session_state.user.get("name", ""))
-        age = st.number_input("Age", min_value=6, max_value=120, value=st.session_state.user.get("age", 18))
-        gender = st.selectbox("Gender", ["Prefer not to say", "Female", "Male", "Non-binary", "Other"], index=0)
-        email = st.text_input("Email", value=st.session_state.user.get("email", ""))
-        submitted = st.form_submit_button("Save")
-        if submitted:
-            st.session_state.user.update({"name": name, "age": int(age), "gender": gender, "email": email})
-            st.success("Saved to session — proceed to the Test page when ready.")
-
-    if st.session_state.user.get("name"):
-        st.markdown("**Saved user:**")
-        st.write(st.session_state.user)
-
-#Page 3 (Test)
-elif page == "Test":
-    st.header("IQ Test — One question at a time")
-    q_index = st.session_state.progress.get("current_q", 0)
-    total_q = len(QUESTIONS)
-
-    #Allow quick navigation bar for progress
-    st.write(f"Question {q_index+1} of {total_q}")
-    
-    # --- FIXED: use q_index instead of current_index ---
-    q = QUESTIONS[q_index]
-
-    # --- TYPING EFFECT FOR QUESTION TEXT ---
-    placeholder = st.empty()
-    typed_key = f"typed_{q_index}"
-    if not st.session_state.get(typed_key, False):
-        with placeholder.container():
-            typing_print_lines(q["text"].split("\n"))
-        st.session_state[typed_key] = True
-    else:
-        placeholder.write(q["text"])
-
-    # --- ANSWER AREA ---
-    answer_key = f"q_{q_index}"
-
-    if q["type"] == "likert":
-        options = DEFAULT_OPTIONS
-        prev_answer = st.session_state.answers.get(answer_key, None)
-
-        ans = st.radio(
-            "Your answer:",
-            options,
-            index=options.index(prev_answer) if prev_answer in options else 2,
-            key=f"{answer_key}_radio"
+#Time this rerun by page; the with block finishes it however the script ends (st.rerun(),
+#st.stop(), an interrupted rerun or an exception), so a sampled profiler never stays on.
+#A section-mode callback starts the timer earlier, so its submit is counted too
+rerun_timer = start_rerun_timer(page)
+
+with rerun_timer:
+    #Page 1 (Introduction)
+    if page == "Introduction":
+        st.title("Streamlit IQ Test App")
+        st.markdown(
+            "This app measures five aspects of intelligence: **Analytical**, **Social**, **Moral**, **Symbolic**, and **Creative-Technical**.\n\n"
+            "You'll register your details, answer a short set of questions and receive a results summary and downloadable certificate."
         )
+        st.markdown("---")
+        st.write("**How it works**")
+        st.write(
+            "You will see one question per page. Use the `Back` and `Next` buttons to move. Your progress is saved in the session so you can come back to where you left off."
+        )
+        st.write(
+            "Prefer fewer clicks? Turn on **Section mode** in the sidebar to answer all questions of a category together."
+        )
+        st.write(
+            "The test includes questions that target: Analytical, Social, Moral, Symbolic, and Creative-Technical intelligence."
+        )
+        st.info("When you're ready, go to 'Register' in the sidebar to begin.")
 
-        # Convert to score 1–5
-        score = options.index(ans) + 1
-        st.session_state.answers[answer_key] = score
+    #Page 2 (Registration)
+    elif page == "Register":
+        st.header("User Registration")
+        with st.form("reg_form"):
+            name = st.text_input("Full name", value=session.user.get("name", ""))
+            age = st.number_input("Age", min_value=6, max_value=120, value=session.user.get("age", 18))
+            gender = st.selectbox("Gender", ["Prefer not to say", "Female", "Male", "Non-binary", "Other"], index=0)
+            email = st.text_input("Email", value=session.user.get("email", ""))
+            submitted = st.form_submit_button("Save")
+            if submitted:
+                session.user.update({"name": name, "age": int(age), "gender": gender, "email": email})
+                st.success("Saved to session — proceed to the Test page when ready.")
 
-    elif q["type"] == "numeric_choice":
-        options = [str(opt) for opt in q["options"]]
-        prev_answer = st.session_state.answers.get(answer_key, None)
+        if session.user.get("name"):
+            st.markdown("**Saved user:**")
+            st.write(session.user)
 
-        ans = st.radio(
-            "Choose the correct number:",
-            options,
-            index=options.index(prev_answer) if prev_answer in options else 0,
-            key=f"{answer_key}_radio"
-        )
+    #Page 3 (Test)
+    elif page == "Test" and st.session_state.section_mode:
+        sections = bank.categories
+        s_index = min(session.progress.get("current_section", 0), len(sections) - 1)
+        category = sections[s_index]
+        st.header(f"IQ Test — {category}")
+        st.write(f"Section {s_index+1} of {len(sections)}")
 
-        # Score = 1 if correct, else 0
-        correct = str(q.get("correct", options[0]))
-        score = 1 if ans == correct else 0
-        st.session_state.answers[answer_key] = score
-
-    elif q["type"] == "numeric_choice_multi":
-        options1 = [str(o) for o in q["options_1"]]
-        options2 = [str(o) for o in q["options_2"]]
-        prev1, prev2 = st.session_state.answers.get(answer_key, (None, None))
-
-        col1, col2 = st.columns(2)
-        with col1:
-            ans1 = st.radio(
-                "First missing number:",
-                options1,
-                index=options1.index(prev1) if prev1 in options1 else 0,
-                key=f"{answer_key}_1"
-            )
-        with col2:
-            ans2 = st.radio(
-                "Second missing number:",
-                options2,
-                index=options2.index(prev2) if prev2 in options2 else 0,
-                key=f"{answer_key}_2"
-            )
+        if session.submitted:
+            st.success("Test submitted — open 'Results' in the sidebar to see your scores.")
+
+        #All questions of the section in one form: one rerun per section instead of per click
+        indexes = bank.by_category[category]
+        with rerun_timer.phase("section_form"), st.form(f"section_{s_index}"):
+            for i in indexes:
+                q = session_question(bank[i], i)
+                st.markdown(f"**{q['text'].strip()}**")
+                render_answer_widgets(q, f"q_{i}", key_prefix="section_")
+                st.markdown("---")
+            cols = st.columns([1, 1, 1])
+            with cols[0]:
+                st.form_submit_button("Back", on_click=commit_section, args=(bank, s_index, -1))
+            with cols[2]:
+                last = s_index == len(sections) - 1
+                st.form_submit_button("Submit" if last else "Next", on_click=commit_section, args=(bank, s_index, 1))
+
+    elif page == "Test":
+        st.header("IQ Test — One question at a time")
+        total_q = len(questions)
+        adaptive = get_adaptive_session(bank) if st.session_state.adaptive_mode else None
+        q_index = min(session.progress.get("current_q", 0), total_q - 1)
 
-        # Store as tuple of integers for safe scoring
-        st.session_state.answers[answer_key] = (int(ans1), int(ans2))
-
-    # --- NAVIGATION BUTTONS ---
-    cols = st.columns([1, 1, 1])
-    if cols[0].button("Back"):
-        if q_index > 0:
-            st.session_state.progress["current_q"] = q_index - 1
-            st.rerun()
-    if cols[2].button("Next"):
-        if q_index < total_q - 1:
-            st.session_state.progress["current_q"] = q_index + 1
-            st.rerun()
+        #Allow quick navigation bar for progress
+        if adaptive is not None:
+            st.write(f"Question {len(adaptive.asked)+1} (adaptive, at most {total_q})")
         else:
-            st.session_state.submitted = True
-            # --- now safe to calculate scores ---
-            st.session_state.scores = calculate_scores(st.session_state.answers, QUESTIONS)
-            st.success("Test submitted — opening results…")
-            st.rerun()
-
-
-
-#Page 4 (Results)
-elif page == "Results":
-    if not st.session_state.get("submitted", False):
-        st.info("You haven't submitted the test yet. Go to 'Test' and finish to see results.")
-    else:
-        st.header("Results")
-        #Simple blossom animation using HTML/CSS + balloons
-        st.markdown("""
-        <div style='text-align:center;'>
-        <div class='flower'></div>
-        </div>
-        <style>
-        .flower{margin:20px auto;width:120px;height:120px;border-radius:50%;position:relative;}
-        .flower:before,.flower:after{content:'';position:absolute;width:60px;height:60px;border-radius:50%;background: radial-gradient(circle at 30% 30%, #ff9a9e, #fad0c4);opacity:0.9;animation:blossom 1.8s ease-in-out infinite;}
-        .flower:before{left:0;transform-origin:60px 30px}
-        .flower:after{right:0;transform-origin:0px 30px}
-        @keyframes blossom{0%{transform:scale(0.2) rotate(0)}50%{transform:scale(1.02) rotate(10deg)}100%{transform:scale(0.95) rotate(0deg)}}
-        </style>
-        """, unsafe_allow_html=True)
-        st.balloons()
-
-        #Show computed scores
-        scores = st.session_state.scores
-        st.subheader(f"Hi {st.session_state.user.get('name', 'Tester')} — here are your scores")
-        for cat, val in scores.items():
-            st.metric(label=cat, value=f"{val:.1f}")
-
-        #Short personalized analysis
-        strongest = max(scores, key=scores.get)
-        weakest = min(scores, key=scores.get)
-        st.markdown("**Summary**")
-        st.write(
-            f"Nice work, {st.session_state.user.get('name', 'friend')}! You show strong {strongest} intelligence — that's a natural strength. "
-            f"You may want to focus on improving {weakest} through targeted activities. Overall, keep exploring and building on your strengths."
-        )
+            st.write(f"Question {q_index+1} of {total_q}")
+    
+        # --- FIXED: use q_index instead of current_index ---
+        q = session_question(questions[q_index], q_index)
 
-        #Suggest careers (basic rule-based suggestions)
-        st.markdown("**Suggested career paths**")
-        suggestions = {
-            "Analytical": ["Data Scientist", "Engineer", "Research Analyst"],
-            "Social": ["Counselor", "Teacher", "PR Specialist"],
-            "Moral": ["Social Worker", "Ethics Officer", "NGO Coordinator"],
-            "Symbolic": ["Designer", "Mathematician", "Cryptographer"],
-            "Creative-Technical": ["Product Designer", "Inventor", "Creative Technologist"],
-        }
-        st.write(", ".join(suggestions.get(strongest, [])))
-
-        #Download certificate
-        st.markdown("---")
-        st.write("Download your certificate below")
-        pdf_bytes = generate_certificate_bytes(
-            name=st.session_state.user.get("name", "Tester"), scores=scores
+        # --- TYPING EFFECT FOR QUESTION TEXT ---
+        placeholder = st.empty()
+        with rerun_timer.phase("question_text"):
+            if not session.is_typed(q_index):
+                with placeholder.container():
+                    typing_print_html(q["text"].split("\n"))
+                session.mark_typed(q_index)
+            else:
+                placeholder.write(q["text"])
+
+        # --- ANSWER AREA ---
+        answer_key = f"q_{q_index}"
+        with rerun_timer.phase("answer_widgets"):
+            selected = render_answer_widgets(q, answer_key)
+            record_answer(bank, q_index, q, answer_from_selection(q, selected))
+
+        # --- NAVIGATION BUTTONS ---
+        cols = st.columns([1, 1, 1])
+        if cols[0].button("Back"):
+            prev_q = adaptive.back() if adaptive is not None else (q_index - 1 if q_index > 0 else None)
+            if prev_q is not None:
+                session.progress["current_q"] = prev_q
+                st.rerun()
+        if cols[2].button("Next"):
+            if adaptive is not None:
+                next_q = adaptive_next_item(adaptive, q, q_index, session.answers[answer_key])
+            else:
+                next_q = q_index + 1 if q_index < total_q - 1 else None
+            if next_q is not None:
+                session.progress["current_q"] = next_q
+                st.rerun()
+            else:
+                with rerun_timer.phase("submit"):
+                    finish_test(bank, adaptive)
+                st.success("Test submitted — opening results…")
+                st.rerun()
+
+
+
+    #Page 4 (Results)
+    elif page == "Results":
+        if not session.submitted:
+            st.info("You haven't submitted the test yet. Go to 'Test' and finish to see results.")
+        else:
+            st.header("Results")
+            #Simple blossom animation using HTML/CSS + balloons
+            st.markdown("""
+            <div style='text-align:center;'>
+            <div class='flower'></div>
+            </div>
+            <style>
+            .flower{margin:20px auto;width:120px;height:120px;border-radius:50%;position:relative;}
+            .flower:before,.flower:after{content:'';position:absolute;width:60px;height:60px;border-radius:50%;background: radial-gradient(circle at 30% 30%, #ff9a9e, #fad0c4);opacity:0.9;animation:blossom 1.8s ease-in-out infinite;}
+            .flower:before{left:0;transform-origin:60px 30px}
+            .flower:after{right:0;transform-origin:0px 30px}
+            @keyframes blossom{0%{transform:scale(0.2) rotate(0)}50%{transform:scale(1.02) rotate(10deg)}100%{transform:scale(0.95) rotate(0deg)}}
+            </style>
+            """, unsafe_allow_html=True)
+            st.balloons()
+
+            #Show computed scores
+            scores = session.scores
+            st.subheader(f"Hi {session.user.get('name', 'Tester')} — here are your scores")
+            norms = get_norm_table()
+            for cat, val in scores.items():
+                avg = norms.average(cat)
+                st.metric(
+                    label=cat,
+                    value=f"{val:.1f}",
+                    delta=f"{val - avg:+.1f} vs average" if avg is not None else None,
+                )
+                pct = norms.percentile(cat, val)
+                if pct is not None:
+                    st.caption(f"Higher than {pct:.0f}% of {norms.count(cat)} test-takers")
+                if session.abilities and cat in session.abilities:
+                    theta, se = session.abilities[cat]
+                    st.caption(f"Adaptive estimate: ability {theta:+.2f} ± {se:.2f}, scaled to the full test")
+
+            #Short personalized analysis
+            strongest = max(scores, key=scores.get)
+            weakest = min(scores, key=scores.get)
+            st.markdown("**Summary**")
+            st.write(
+                f"Nice work, {session.user.get('name', 'friend')}! You show strong {strongest} intelligence — that's a natural strength. "
+                f"You may want to focus on improving {weakest} through targeted activities. Overall, keep exploring and building on your strengths."
+            )
+
+            #Suggest careers (basic rule-based suggestions)
+            st.markdown("**Suggested career paths**")
+            suggestions = {
+                "Analytical": ["Data Scientist", "Engineer", "Research Analyst"],
+                "Social": ["Counselor", "Teacher", "PR Specialist"],
+                "Moral": ["Social Worker", "Ethics Officer", "NGO Coordinator"],
+                "Symbolic": ["Designer", "Mathematician", "Cryptographer"],
+                "Creative-Technical": ["Product Designer", "Inventor", "Creative Technologist"],
+            }
+            st.write(", ".join(suggestions.get(strongest, [])))
+
+            #Download certificate
+            st.markdown("---")
+            st.write("Download your certificate below")
+            with rerun_timer.phase("certificate"):
+                pdf_bytes = generate_certificate_bytes(
+                    name=session.user.get("name", "Tester"), scores=scores
+                )
+            st.download_button(
+            label="Download Certificate (PDF)",
+            data=pdf_bytes,
+            file_name=f"IQ_Certificate_{session.user.get('name','Tester').replace(' ','_')}.pdf",
+            mime="application/pdf",
         )
-        st.download_button(
-        label="Download Certificate (PDF)",
-        data=pdf_bytes,
-        file_name=f"IQ_Certificate_{st.session_state.user.get('name','Tester').replace(' ','_')}.pdf",
-        mime="application/pdf",
-    )
 
+            #Email delivery only queues the message; a worker pool sends it
+            email = session.user.get("email", "")
+            if email and get_email_queue() is not None:
+                if st.button(f"Email certificate to {email}"):
+                    try:
+                        email_certificate(email, session.user.get("name", "Tester"), pdf_bytes)
+                    except ValueError as exc:
+                        st.error(str(exc))
+                    else:
+                        st.success("Your certificate is on its way.")
+
+    #Snapshot the session for resuming elsewhere; the write itself happens off this thread
+    with rerun_timer.phase("checkpoint"):
+        checkpoint_session()
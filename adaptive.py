@@ -0,0 +1,162 @@
+import numpy as np
+
+#Ability scale used for every lookup table; estimates are snapped to this grid
+THETA_GRID = np.linspace(-4.0, 4.0, 81)
+
+#Standard-normal prior on ability, as log density over THETA_GRID
+_LOG_PRIOR = -0.5 * THETA_GRID ** 2
+
+#Default two-parameter logistic (2PL) item parameters for questions without an "irt" entry
+DEFAULT_DISCRIMINATION = 1.0
+DEFAULT_DIFFICULTY = 0.0
+
+
+def item_response(q, answer):
+    """
+    q: question dict
+    answer: stored answer value
+    Returns: response in [0, 1] for the 2PL likelihood, or None when it carries no information
+    """
+    if answer is None:
+        return None
+    if q["type"] == "likert":
+        return (int(answer) - 1) / 4
+    if q["type"] == "numeric_choice":
+        return None if q.get("correct") is None else float(int(answer) == int(q["correct"]))
+    keys = (q.get("correct_1"), q.get("correct_2"))
+    if None in keys or not isinstance(answer, (tuple, list)):
+        return None
+    return sum(int(a) == int(k) for a, k in zip(answer, keys)) / 2
+
+
+def expected_score(q, p):
+    """
+    q: question dict
+    p: 2PL response probability
+    Returns: expected score of q under calculate_scores rules (Likert 1-5, 1 per keyed part)
+    """
+    if q["type"] == "likert":
+        return 1 + 4 * p
+    if q["type"] == "numeric_choice":
+        return p if q.get("correct") is not None else 0.0
+    return p * sum(q.get(key) is not None for key in ("correct_1", "correct_2"))
+
+
+class ItemPool:
+    """
+    2PL parameters for a question bank with the response-probability and
+    item-information tables precomputed on THETA_GRID (items x grid points).
+    Built once per bank and shared by every adaptive session.
+    """
+
+    def __init__(self, questions):
+        self.categories = list(dict.fromkeys(q["category"] for q in questions))
+        irt = [q.get("irt", {}) for q in questions]
+        self.a = np.array([p.get("a", DEFAULT_DISCRIMINATION) for p in irt], dtype=np.float64)
+        self.b = np.array([p.get("b", DEFAULT_DIFFICULTY) for p in irt], dtype=np.float64)
+        self.category = np.array([self.categories.index(q["category"]) for q in questions])
+        self.questions = questions
+
+        p = 1.0 / (1.0 + np.exp(-self.a[:, None] * (THETA_GRID[None, :] - self.b[:, None])))
+        p = np.clip(p, 1e-9, 1 - 1e-9)
+        self.log_p = np.log(p)
+        self.log_q = np.log1p(-p)
+        self.information = self.a[:, None] ** 2 * p * (1 - p)
+        self.by_category = [np.flatnonzero(self.category == c) for c in range(len(self.categories))]
+
+    def log_likelihood(self, item, response):
+        return response * self.log_p[item] + (1 - response) * self.log_q[item]
+
+
+class AdaptiveSession:
+    """
+    Per-session adaptive test state: the items asked so far and one log
+    posterior over THETA_GRID per category. Categories are tested in bank
+    order; each stops once its standard error reaches se_target or
+    max_per_category items were asked.
+    """
+
+    def __init__(self, pool, se_target=0.5, min_per_category=1, max_per_category=None):
+        self.pool = pool
+        self.se_target = se_target
+        self.min_per_category = min_per_category
+        self.max_per_category = max_per_category
+        self.asked = []
+        self.responses = {}
+        self.log_posterior = [_LOG_PRIOR.copy() for _ in pool.categories]
+
+    def record(self, item, response):
+        """Fold one answer into its category's posterior; re-answering replaces the old response."""
+        cat = self.pool.category[item]
+        old = self.responses.get(item)
+        if old is not None:
+            self.log_posterior[cat] -= self.pool.log_likelihood(item, old)
+        if response is not None:
+            self.log_posterior[cat] += self.pool.log_likelihood(item, response)
+        self.responses[item] = response
+        if item not in self.asked:
+            self.asked.append(item)
+
+    def _weights(self, category):
+        log_post = self.log_posterior[category]
+        weights = np.exp(log_post - log_post.max())
+        return weights / weights.sum()
+
+    def estimate(self, category):
+        """Returns: (expected a posteriori ability, posterior standard error) for a category index"""
+        weights = self._weights(category)
+        theta = float(weights @ THETA_GRID)
+        se = float(np.sqrt(weights @ (THETA_GRID - theta) ** 2))
+        return theta, se
+
+    def next_item(self):
+        """Returns: index of the most informative unasked item, or None when the test is done"""
+        asked = np.zeros(len(self.pool.category), dtype=bool)
+        asked[self.asked] = True
+        for cat, items in enumerate(self.pool.by_category):
+            remaining = items[~asked[items]]
+            n_asked = len(items) - len(remaining)
+            if not len(remaining):
+                continue
+            if self.max_per_category is not None and n_asked >= self.max_per_category:
+                continue
+            theta, se = self.estimate(cat)
+            if n_asked >= self.min_per_category and se <= self.se_target:
+                continue
+            grid_index = int(np.abs(THETA_GRID - theta).argmin())
+            return int(remaining[self.pool.information[remaining, grid_index].argmax()])
+        return None
+
+    def back(self):
+        """
+        Returns: the last recorded item, taken back out of the posterior so it can
+        be answered again, or None when nothing was recorded yet
+        """
+        if not self.asked:
+            return None
+        item = self.asked.pop()
+        old = self.responses.pop(item, None)
+        if old is not None:
+            self.log_posterior[self.pool.category[item]] -= self.pool.log_likelihood(item, old)
+        return item
+
+    def abilities(self):
+        """Returns: dict {category: (ability, standard error)}"""
+        return {name: self.estimate(c) for c, name in enumerate(self.pool.categories)}
+
+    def full_length_scores(self, observed):
+        """
+        observed: dict {category: score} over the items answered so far
+        Returns: dict {category: score} on the full-length scale, the observed
+        score plus the posterior expected score of every item not asked
+        """
+        asked = np.zeros(len(self.pool.category), dtype=bool)
+        asked[self.asked] = True
+        scores = {}
+        for cat, items in enumerate(self.pool.by_category):
+            remaining = items[~asked[items]]
+            p = np.exp(self.pool.log_p[remaining]) @ self._weights(cat)
+            expected = sum(expected_score(self.pool.questions[i], pi) for i, pi in zip(remaining, p))
+            name = self.pool.categories[cat]
+            scores[name] = round(observed.get(name, 0.0) + float(expected), 1)
+        return scores
@@ -0,0 +1,180 @@
+import numpy as np
+
+#Batch re-scoring: score many stored respondents at once with NumPy.
+#Answers are laid out as a respondents x columns matrix. Every question gets one
+#column, except numeric_choice_multi which gets one column per missing number.
+
+
+def question_columns(questions):
+    """
+    questions: list of question dicts
+    Returns: list of question indexes, one entry per answer-matrix column
+    """
+    columns = []
+    for i, q in enumerate(questions):
+        parts = 2 if q["type"] == "numeric_choice_multi" else 1
+        columns.extend([i] * parts)
+    return columns
+
+
+#Answer conversions follow calculate_scores: a Likert answer counts as int(value)
+#(0 when that fails); numeric answers are compared as floats, and anything that
+#is not a number becomes NaN, which never matches a key
+_NAN_PAIR = (np.nan, np.nan)
+
+
+def _likert_number(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
+def _choice_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _pair(value):
+    if isinstance(value, (tuple, list)) and len(value) == 2:
+        return _choice_number(value[0]), _choice_number(value[1])
+    return _NAN_PAIR
+
+
+def _number_column(values, likert):
+    #Fast path: a column of plain numbers converts in one C-level pass
+    if set(map(type, values)) <= {int, float, bool}:
+        column = np.asarray(values, dtype=np.float64)
+        if likert:
+            column = np.trunc(column)
+            column[~np.isfinite(column)] = 0
+        return column
+    return np.fromiter(map(_likert_number if likert else _choice_number, values), np.float64, len(values))
+
+
+def answers_to_matrix(answer_dicts, questions):
+    """
+    answer_dicts: iterable of stored answers dicts { 'q_0': value, ... }
+    questions: list of question dicts
+    Returns: float array of shape (respondents, columns), converted one column at a time
+    """
+    answer_dicts = list(answer_dicts)
+    columns = []
+    for i, q in enumerate(questions):
+        key = f"q_{i}"
+        if q["type"] == "numeric_choice_multi":
+            pairs = np.fromiter(
+                (part for answers in answer_dicts for part in _pair(answers.get(key))),
+                np.float64, 2 * len(answer_dicts),
+            ).reshape(len(answer_dicts), 2)
+            columns += [pairs[:, 0], pairs[:, 1]]
+        else:
+            values = [answers.get(key, 0) for answers in answer_dicts]
+            columns.append(_number_column(values, q["type"] == "likert"))
+    if not columns:
+        return np.zeros((len(answer_dicts), 0))
+    return np.column_stack(columns)
+
+
+def answer_key_columns(questions):
+    """
+    questions: list of question dicts
+    Returns: per-column correct answers from the bank; NaN for Likert columns,
+        which keep the raw value. Generated items differ per session, so stored
+        results should be scored with answer_key_matrix instead.
+    """
+    key = []
+    for q in questions:
+        if q["type"] == "numeric_choice":
+            key.append(q.get("correct", np.nan))
+        elif q["type"] == "numeric_choice_multi":
+            key.extend([q.get("correct_1", np.nan), q.get("correct_2", np.nan)])
+        else:
+            key.append(np.nan)
+    return np.asarray(key, dtype=np.float64)
+
+
+def answer_key_matrix(key_dicts, questions):
+    """
+    key_dicts: iterable of per-respondent answer keys {'q_<i>': correct answer}
+        as stored with each result (ResultsStore answer_keys)
+    questions: list of question dicts
+    Returns: float array of shape (respondents, columns); missing keys fall back
+        to the bank's (answer_key_columns)
+    """
+    bank_key = answer_key_columns(questions)
+    #Answer-matrix columns of each keyed (non-Likert) question
+    keyed = {}
+    for col, qi in enumerate(question_columns(questions)):
+        if questions[qi]["type"] != "likert":
+            keyed.setdefault(f"q_{qi}", []).append(col)
+    rows = []
+    for keys in key_dicts:
+        row = bank_key.copy()
+        for key, value in keys.items():
+            cols = keyed.get(key)
+            if cols is None:
+                continue
+            parts = value if isinstance(value, (tuple, list)) else (value,)
+            for col, part in zip(cols, parts):
+                row[col] = _to_float(part)
+        rows.append(row)
+    return np.asarray(rows, dtype=np.float64).reshape(len(rows), len(bank_key))
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def score_results(results, questions, weights=None):
+    """
+    results: stored results (dicts from results_store.iter_results)
+    questions: list of question dicts
+    Returns: (categories, array of shape (respondents, categories)), each
+        respondent scored against the items they actually saw
+    """
+    results = list(results)
+    matrix = answers_to_matrix([r["answers"] for r in results], questions)
+    key = answer_key_matrix([r.get("answer_keys") or {} for r in results], questions)
+    return batch_calculate_scores(matrix, questions, answer_key=key, weights=weights)
+
+
+def category_matrix(questions, weights=None):
+    """
+    questions: list of question dicts
+    weights: optional per-question weights (defaults to 1.0 for every question)
+    Returns: (categories, array of shape (columns, categories))
+    """
+    categories = list(dict.fromkeys(q["category"] for q in questions))
+    columns = question_columns(questions)
+    weights = np.ones(len(questions)) if weights is None else np.asarray(weights, dtype=np.float64)
+    mapping = np.zeros((len(columns), len(categories)))
+    for col, qi in enumerate(columns):
+        mapping[col, categories.index(questions[qi]["category"])] = weights[qi]
+    return categories, mapping
+
+
+def batch_calculate_scores(matrix, questions, answer_key=None, weights=None):
+    """
+    matrix: array of shape (respondents, columns) from answers_to_matrix
+    questions: list of question dicts
+    answer_key: optional correct answers, per column (default: answer_key_columns)
+        or per respondent and column (answer_key_matrix); keyed entries score 1
+        when the answer matches and 0 otherwise. NaN entries of Likert columns
+        keep the raw value; numeric columns without a key score 0
+    weights: optional per-question weights
+    Returns: (categories, array of shape (respondents, categories))
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    key = answer_key_columns(questions) if answer_key is None else np.asarray(answer_key, dtype=np.float64)
+    #Numeric columns always score against the key, so a missing key scores 0 like calculate_scores
+    numeric = np.array([questions[qi]["type"] != "likert" for qi in question_columns(questions)], dtype=bool)
+    keyed = ~np.isnan(key) | numeric
+    matrix = np.where(keyed, matrix == key, matrix)
+    categories, mapping = category_matrix(questions, weights)
+    return categories, matrix @ mapping
@@ -0,0 +1,86 @@
+"""Simulated adaptive tests against fixed-length tests on a synthetic item bank.
+
+Draws examinees with known abilities, answers each item from the 2PL model,
+and compares items per test and ability RMSE for adaptive.AdaptiveSession
+against asking every item. Also reports the cost of one next_item() call.
+
+Run: python benchmarks/bench_adaptive.py --examinees 500 --items-per-category 60
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from adaptive import AdaptiveSession, ItemPool
+
+CATEGORIES = ["Analytical", "Social", "Moral", "Symbolic", "Creative-Technical"]
+
+
+def synthetic_bank(items_per_category, rng):
+    return [
+        {
+            "text": f" {cat} item {i}",
+            "category": cat,
+            "type": "numeric_choice",
+            "options": [0, 1],
+            "irt": {"a": float(rng.uniform(0.8, 2.2)), "b": float(rng.normal(0, 1.2))},
+        }
+        for cat in CATEGORIES
+        for i in range(items_per_category)
+    ]
+
+
+def simulate(pool, true_theta, rng, se_target, full):
+    session = AdaptiveSession(pool, se_target=0.0 if full else se_target)
+    seconds = 0.0
+    while True:
+        start = time.perf_counter()
+        item = session.next_item()
+        seconds += time.perf_counter() - start
+        if item is None:
+            break
+        theta = true_theta[pool.category[item]]
+        p = 1 / (1 + np.exp(-pool.a[item] * (theta - pool.b[item])))
+        session.record(item, float(rng.random() < p))
+    estimates = np.array([session.estimate(c)[0] for c in range(len(pool.categories))])
+    return len(session.asked), estimates, seconds / (len(session.asked) + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--examinees", type=int, default=300)
+    parser.add_argument("--items-per-category", type=int, default=60)
+    parser.add_argument("--se-target", type=float, default=0.4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    start = time.perf_counter()
+    pool = ItemPool(synthetic_bank(args.items_per_category, rng))
+    build_ms = (time.perf_counter() - start) * 1000
+
+    results = {}
+    for label, full in (("fixed", True), ("adaptive", False)):
+        lengths, errors, select = [], [], []
+        for _ in range(args.examinees):
+            true_theta = rng.normal(0, 1, len(CATEGORIES))
+            n_items, estimates, per_call = simulate(pool, true_theta, rng, args.se_target, full)
+            lengths.append(n_items)
+            errors.append(estimates - true_theta)
+            select.append(per_call)
+        results[label] = (np.mean(lengths), np.sqrt(np.mean(np.square(errors))), np.mean(select))
+
+    print(f"bank: {len(pool.a)} items, tables built in {build_ms:.1f} ms")
+    for label, (length, rmse, per_call) in results.items():
+        print(f"{label:>8}: {length:6.1f} items per test, ability RMSE {rmse:.3f}, "
+              f"next_item {per_call * 1e6:.1f} us")
+    print(f"adaptive tests are {100 * (1 - results['adaptive'][0] / results['fixed'][0]):.0f}% shorter "
+          f"at SE target {args.se_target}")
+
+
+if __name__ == "__main__":
+    main()
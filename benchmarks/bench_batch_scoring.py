@@ -0,0 +1,66 @@
+"""Throughput of batch_scoring.batch_calculate_scores against calculate_scores.
+
+Builds a synthetic cohort of stored answers for QUESTIONS, checks that both paths
+agree, then reports respondents/sec for each.
+
+Run: python benchmarks/bench_batch_scoring.py --respondents 200000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from batch_scoring import answers_to_matrix, batch_calculate_scores
+from utils import QUESTIONS, calculate_scores
+
+
+def random_answers(rng, questions):
+    answers = {}
+    for i, q in enumerate(questions):
+        if q["type"] == "likert":
+            answers[f"q_{i}"] = rng.randint(1, 5)
+        elif q["type"] == "numeric_choice":
+            answers[f"q_{i}"] = rng.choice(q["options"])
+        else:
+            answers[f"q_{i}"] = (rng.choice(q["options_1"]), rng.choice(q["options_2"]))
+    return answers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--respondents", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cohort = [random_answers(rng, QUESTIONS) for _ in range(args.respondents)]
+
+    start = time.perf_counter()
+    expected = [calculate_scores(a, QUESTIONS) for a in cohort]
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matrix = answers_to_matrix(cohort, QUESTIONS)
+    convert_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    categories, scores = batch_calculate_scores(matrix, QUESTIONS)
+    batch_s = time.perf_counter() - start
+
+    reference = np.array([[row[c] for c in categories] for row in expected], dtype=np.float64)
+    assert np.array_equal(reference, scores), "batch scores differ from calculate_scores"
+
+    n = args.respondents
+    print(f"respondents:              {n}")
+    print(f"calculate_scores loop:    {loop_s:.3f} s ({n / loop_s:,.0f} respondents/s)")
+    print(f"answers_to_matrix:        {convert_s:.3f} s ({n / convert_s:,.0f} respondents/s)")
+    print(f"batch_calculate_scores:   {batch_s:.3f} s ({n / batch_s:,.0f} respondents/s)")
+
+
+if __name__ == "__main__":
+    main()
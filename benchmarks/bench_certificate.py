@@ -0,0 +1,73 @@
+"""Per-certificate CPU time of utils.generate_certificate_bytes.
+
+Reports the original renderer (new canvas and full redraw every call), the
+current renderer with an empty cache, and a Results-page rerun that hits the
+LRU cache.
+
+Run: python benchmarks/bench_certificate.py --count 500
+"""
+import argparse
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils
+
+SCORES = {"Analytical": 9, "Social": 12, "Moral": 11, "Symbolic": 10, "Creative-Technical": 13}
+
+
+def legacy_certificate_bytes(name, scores):
+    #The renderer as it was before the cached layout and PDF cache were introduced
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import letter
+
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+    c.setFont("Helvetica-Bold", 24)
+    c.drawCentredString(width / 2, height - 1.5 * 72, "Certificate of Assessment")
+    c.setFont("Helvetica", 14)
+    c.drawCentredString(width / 2, height - 1.9 * 72, "Awarded to")
+    c.setFont("Helvetica-Bold", 20)
+    c.drawCentredString(width / 2, height - 2.4 * 72, name)
+    c.setFont("Helvetica", 12)
+    c.drawCentredString(width / 2, height - 2.8 * 72, "Tested with Streamlit IQ Test App")
+    y = height - 3.4 * 72
+    for cat, val in scores.items():
+        c.drawString(72, y, f"{cat}: {val:.2f} / 5")
+        y -= 0.3 * 72
+    c.showPage()
+    c.save()
+    buffer.seek(0)
+    return buffer.getvalue()
+
+
+def per_call(fn, count):
+    start = time.process_time()
+    for i in range(count):
+        fn(i)
+    return (time.process_time() - start) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=300)
+    args = parser.parse_args()
+
+    legacy = per_call(lambda i: legacy_certificate_bytes(f"Tester {i}", SCORES), args.count)
+    utils._render_certificate.cache_clear()
+    cold = per_call(lambda i: utils.generate_certificate_bytes(f"Tester {i}", SCORES), args.count)
+    utils.generate_certificate_bytes("Tester", SCORES)
+    cached = per_call(lambda i: utils.generate_certificate_bytes("Tester", SCORES), args.count)
+
+    print(f"legacy renderer:        {legacy * 1000:.3f} ms CPU per certificate")
+    print(f"current, cache miss:    {cold * 1000:.3f} ms CPU per certificate")
+    print(f"current, cache hit:     {cached * 1000:.4f} ms CPU per Results rerun")
+    print(f"cache: {utils._render_certificate.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
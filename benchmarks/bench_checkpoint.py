@@ -0,0 +1,95 @@
+"""Rerun-path cost of session checkpoints, per backend.
+
+Simulates concurrent test-takers answering questions: every answer takes a
+CompactSession snapshot and calls CheckpointStore.save(), timed as the rerun
+would see it. The synchronous baseline writes each snapshot straight to the
+backend. "memory" with --latency stands in for a Redis server over the network.
+Also reports how many saves were coalesced and the cost of restoring a session.
+
+Run: python benchmarks/bench_checkpoint.py --sessions 200 --answers 15 --latency 0.001
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checkpoint import CheckpointStore, MemoryBackend, SQLiteBackend, new_token
+from session import CompactSession
+
+
+def answer_events(sessions, answers, rng):
+    #(session index, question) in interleaved order, like concurrent users
+    events = [(s, q) for s in range(sessions) for q in range(answers)]
+    rng.shuffle(events)
+    events.sort(key=lambda e: e[1])
+    return events
+
+
+def percentile(values, pct):
+    return sorted(values)[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(backend, sessions, answers, rng, asynchronous):
+    tokens = [new_token() for _ in range(sessions)]
+    states = [CompactSession(answers) for _ in range(sessions)]
+    store = CheckpointStore(backend) if asynchronous else None
+    latencies = []
+    start = time.perf_counter()
+    for s, q in answer_events(sessions, answers, rng):
+        session = states[s]
+        t0 = time.perf_counter()
+        session.answers[f"q_{q}"] = rng.randint(1, 5)
+        session.current_q = q
+        data = session.to_bytes()
+        if store is not None:
+            store.save(tokens[s], data)
+        else:
+            backend.set(tokens[s], data, ex=3600)
+        latencies.append(time.perf_counter() - t0)
+    if store is not None:
+        store.flush()
+        store.close()
+    total = time.perf_counter() - start
+
+    t0 = time.perf_counter()
+    for token in tokens:
+        CompactSession.from_bytes(backend.get(token))
+    restore = (time.perf_counter() - t0) / sessions
+    stats = store.stats if store is not None else {"written": len(latencies), "coalesced": 0}
+    return latencies, total, restore, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--answers", type=int, default=15)
+    parser.add_argument("--latency", type=float, default=0.001, help="seconds per call of the memory backend")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {
+            "sqlite": lambda mode: SQLiteBackend(os.path.join(tmp, f"{mode}.db")),
+            "memory": lambda mode: MemoryBackend(latency=args.latency),
+        }
+        print(f"{args.sessions} sessions x {args.answers} answers")
+        for name, make in backends.items():
+            for mode, asynchronous in (("sync", False), ("async", True)):
+                latencies, total, restore, stats = run(make(mode), args.sessions, args.answers, rng, asynchronous)
+                print(
+                    f"{name:>6} {mode:>5}: per answer p50={statistics.median(latencies) * 1e6:8.1f} us"
+                    f"  p99={percentile(latencies, 99) * 1e6:8.1f} us"
+                    f"  all persisted in {total:6.2f} s"
+                    f"  writes={stats['written']} coalesced={stats['coalesced']}"
+                    f"  restore={restore * 1e6:.0f} us"
+                )
+
+
+if __name__ == "__main__":
+    main()
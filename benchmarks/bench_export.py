@@ -0,0 +1,57 @@
+"""Rows/sec and peak memory of export_results for CSV and Parquet.
+
+Fills a temporary results store with synthetic submissions, then exports it
+in each format: once for throughput, once under tracemalloc for peak heap.
+
+Run: python benchmarks/bench_export.py --rows 500000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import export_results
+import utils  # noqa: F401  (import cost is not part of the export)
+from results_store import ResultsStore
+
+USER = {"name": "Test Person", "age": 30, "gender": "Prefer not to say", "email": "test@example.com"}
+ANSWERS = {f"q_{i}": 1 + i % 5 for i in range(15)} | {"q_0": 1, "q_2": (101, 175)}
+SCORES = {"Analytical": 9, "Social": 12, "Moral": 11, "Symbolic": 10, "Creative-Technical": 13}
+
+
+def fill(path, rows):
+    store = ResultsStore(path, batch_size=5000)
+    start = time.time() - rows
+    for i in range(rows):
+        store.submit(USER, ANSWERS, SCORES, started_at=start + i - 60, submitted_at=start + i)
+    store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "results.db")
+        fill(db, args.rows)
+        for name in ("export.csv", "export.parquet"):
+            out = os.path.join(tmp, name)
+            argv = [out, "--db", db, "--chunk-size", str(args.chunk_size)]
+            start = time.perf_counter()
+            export_results.main(argv)
+            elapsed = time.perf_counter() - start
+            tracemalloc.start()
+            export_results.main(argv)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{name:>15}: {args.rows / elapsed:>9,.0f} rows/s, peak heap {peak / 2**20:.1f} MiB, "
+                  f"file {os.path.getsize(out) / 2**20:.1f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Import-time profile of the app's modules, based on python -X importtime.
+
+Imports each module in a fresh interpreter, reports its cumulative import time
+and the slowest packages it pulls in, and fails when a module exceeds its budget
+or loads a dependency it should not. With --check-pages it also renders the
+Introduction, Register and Test pages through AppTest and fails if reportlab
+was loaded before the Results page.
+
+Run: python benchmarks/bench_import_time.py --check-pages --json import_time.json
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#module -> (budget in ms, packages it must not import)
+DEFAULT_BUDGETS = {
+    "utils": (2000.0, ("reportlab", "numpy")),
+}
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_import(module, runs=3):
+    """
+    Returns: (best cumulative ms for module, {top-level package: cumulative ms}, imported module names)
+    """
+    best, packages, names = None, {}, set()
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        run_packages = {}
+        for line in proc.stderr.splitlines():
+            match = _LINE.match(line)
+            if not match:
+                continue
+            cumulative_us, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+            names.add(name)
+            if name == module and indent == 1:
+                total = cumulative_us / 1000
+                best = total if best is None else min(best, total)
+            top = name.split(".")[0]
+            if "." not in name or indent == 1:
+                run_packages[top] = max(run_packages.get(top, 0.0), cumulative_us / 1000)
+        packages = run_packages
+    return best, packages, names
+
+
+def check_pages():
+    """Render the pages before Results and return the reportlab modules that got imported."""
+    from streamlit.testing.v1 import AppTest
+
+    #Keep the rendered pages' results store, norms and checkpoints out of the working directory
+    tmp = tempfile.mkdtemp(prefix="iq_import_time_")
+    os.environ.setdefault("IQ_RESULTS_DB", os.path.join(tmp, "results.db"))
+    os.environ.setdefault("IQ_NORMS", os.path.join(tmp, "norms.json"))
+    os.environ.setdefault("IQ_CHECKPOINTS", "memory://")
+    at = AppTest.from_file(os.path.join(ROOT, "IQ_TEST.py"), default_timeout=30)
+    at.run()
+    for page in ("Introduction", "Register", "Test"):
+        at.sidebar.selectbox[0].select(page).run()
+        if at.exception:
+            raise RuntimeError(f"{page}: {at.exception[0].value}")
+    return sorted(name for name in sys.modules if name.split(".")[0] == "reportlab")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per module; the best run counts")
+    parser.add_argument("--budget-ms", type=float, default=None, help="override every module's budget")
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--check-pages", action="store_true")
+    parser.add_argument("--json", help="write the profile to this file")
+    args = parser.parse_args()
+
+    report, failures = {}, []
+    for module, (budget, forbidden) in DEFAULT_BUDGETS.items():
+        budget = args.budget_ms if args.budget_ms is not None else budget
+        total, packages, names = profile_import(module, args.runs)
+        loaded = sorted(p for p in forbidden if any(n.split(".")[0] == p for n in names))
+        report[module] = {"cumulative_ms": total, "budget_ms": budget, "forbidden_loaded": loaded, "packages_ms": packages}
+        print(f"{module}: {total:.1f} ms (budget {budget:.0f} ms)")
+        for name, ms in sorted(packages.items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"  {name:<24} {ms:8.1f} ms")
+        if total > budget:
+            failures.append(f"{module} took {total:.1f} ms to import, budget is {budget:.0f} ms")
+        if loaded:
+            failures.append(f"{module} imports {', '.join(loaded)} at import time")
+
+    if args.check_pages:
+        loaded = check_pages()
+        report["pages_before_results"] = {"reportlab_modules": loaded}
+        print(f"reportlab modules loaded before Results: {len(loaded)}")
+        if loaded:
+            failures.append("reportlab is imported before the Results page")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
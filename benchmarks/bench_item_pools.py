@@ -0,0 +1,37 @@
+"""Build throughput of item_generator pools and the cost of picking an item.
+
+Run: python benchmarks/bench_item_pools.py --size 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from item_generator import FAMILIES, build_pool, pick_item
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200, help="items per pool")
+    parser.add_argument("--pools", type=int, default=20, help="pools built per family (different seeds)")
+    parser.add_argument("--picks", type=int, default=200_000)
+    args = parser.parse_args()
+
+    for family in FAMILIES:
+        start = time.perf_counter()
+        for seed in range(args.pools):
+            pool = build_pool(family, args.size, seed)
+        elapsed = time.perf_counter() - start
+        items = args.size * args.pools
+
+        start = time.perf_counter()
+        for i in range(args.picks):
+            pick_item(pool, i, i % 15)
+        pick = (time.perf_counter() - start) / args.picks
+        print(f"{family:>26}: {items / elapsed:>9,.0f} validated items/s, pick_item {pick * 1e9:.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
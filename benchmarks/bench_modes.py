@@ -0,0 +1,76 @@
+"""Reruns and server CPU per completed test, per-question mode vs section mode.
+
+Completes the test through streamlit.testing.v1.AppTest in each mode and counts
+every script execution (including st.rerun() restarts) and the process CPU time
+spent while answering.
+
+Run: python benchmarks/bench_modes.py --tests 5
+"""
+import argparse
+import os
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "IQ_TEST.py")
+
+
+class ScriptRunCounter:
+    """Counts script executions (st.rerun() restarts included) via LocalScriptRunner._on_script_finished."""
+
+    def __init__(self):
+        from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+        self.count = 0
+        self._runner = LocalScriptRunner
+        original = self._runner._on_script_finished
+
+        def counted(runner, *args, **kwargs):
+            self.count += 1
+            return original(runner, *args, **kwargs)
+
+        self._runner._on_script_finished = counted
+
+
+def _next_button(at, labels):
+    return next(b for b in at.button if b.label in labels)
+
+
+def complete_test(section_mode):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=30).run()
+    if section_mode:
+        at.sidebar.checkbox[0].check().run()
+    at.sidebar.selectbox[0].select("Test").run()
+    while not at.session_state["session"].submitted:
+        _next_button(at, ("Next", "Submit")).click().run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+    return at
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tests", type=int, default=3, help="completed tests per mode")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="iq_bench_modes_")
+    os.environ.setdefault("IQ_RESULTS_DB", os.path.join(tmp, "results.db"))
+    os.environ.setdefault("IQ_NORMS", os.path.join(tmp, "norms.json"))
+    os.environ.setdefault("IQ_CHECKPOINTS", "memory://")
+
+    counter = ScriptRunCounter()
+    complete_test(False)  #warm imports and caches
+    for label, section_mode in (("per-question", False), ("section", True)):
+        counter.count = 0
+        cpu = time.process_time()
+        for _ in range(args.tests):
+            complete_test(section_mode)
+        cpu = time.process_time() - cpu
+        print(f"{label:>12} mode: {counter.count / args.tests:.1f} reruns and "
+              f"{cpu / args.tests * 1000:.0f} ms server CPU per completed test")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Startup time and per-session memory of a large external question bank.
+
+Writes a synthetic bank as JSON and SQLite, then reports parse + validate time,
+the cost of a cached lookup through utils.get_question_bank, and memory for one
+shared bank versus a private copy per session.
+
+Run: python benchmarks/bench_question_bank.py --questions 5000 --sessions 200
+"""
+import argparse
+import copy
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils
+from question_bank import QuestionBank
+
+
+def synthetic_questions(n):
+    categories = ["Analytical", "Social", "Moral", "Symbolic", "Creative-Technical"]
+    questions = []
+    for i in range(n):
+        cat = categories[i % len(categories)]
+        if i % 7 == 0:
+            questions.append({"text": f" Sequence item {i}: 2, 4, 8, 16?", "category": cat,
+                              "type": "numeric_choice", "options": [32, 34, 36, 40], "correct": 32})
+        else:
+            questions.append({"text": f" Statement {i} about {cat.lower()} thinking.", "category": cat, "type": "likert"})
+    return questions
+
+
+def write_banks(questions, directory):
+    json_path = os.path.join(directory, "bank.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(questions, f)
+    db_path = os.path.join(directory, "bank.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE questions (position INTEGER PRIMARY KEY, data TEXT NOT NULL)")
+    conn.executemany("INSERT INTO questions VALUES (?, ?)", ((i, json.dumps(q)) for i, q in enumerate(questions)))
+    conn.commit()
+    conn.close()
+    return json_path, db_path
+
+
+def traced(fn):
+    tracemalloc.start()
+    result = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, db_path = write_banks(synthetic_questions(args.questions), tmp)
+        for label, path in (("json", json_path), ("sqlite", db_path)):
+            start = time.perf_counter()
+            QuestionBank.load(path)
+            print(f"{label:>6} load + validate + index: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        utils.get_question_bank(json_path)
+        start = time.perf_counter()
+        for _ in range(1000):
+            bank = utils.get_question_bank(json_path)
+        print(f"cached get_question_bank:        {(time.perf_counter() - start) * 1000:.3f} us per rerun")
+
+        _, shared = traced(lambda: [utils.get_question_bank(json_path).questions for _ in range(args.sessions)])
+        _, copied = traced(lambda: [copy.deepcopy(bank.questions) for _ in range(args.sessions)])
+        print(f"{args.sessions} sessions sharing the bank: {shared / args.sessions:,.0f} bytes per session")
+        print(f"{args.sessions} sessions copying the bank: {copied / args.sessions:,.0f} bytes per session")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Submission throughput of results_store.ResultsStore.
+
+Measures how long submit() blocks the caller (the Test page's submit click) and
+how many submissions per second the background writer persists.
+
+Run: python benchmarks/bench_results_store.py --submissions 50000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from results_store import ResultsStore
+
+USER = {"name": "Test Person", "age": 30, "gender": "Prefer not to say", "email": "test@example.com"}
+ANSWERS = {f"q_{i}": 3 for i in range(15)} | {"q_2": (101, 175)}
+SCORES = {"Analytical": 9, "Social": 12, "Moral": 11, "Symbolic": 10, "Creative-Technical": 13}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submissions", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultsStore(os.path.join(tmp, "results.db"), batch_size=args.batch_size)
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(args.submissions):
+            t0 = time.perf_counter()
+            store.submit(USER, ANSWERS, SCORES, started_at=time.time())
+            latencies.append(time.perf_counter() - t0)
+        enqueued = time.perf_counter() - start
+        store.flush()
+        persisted = time.perf_counter() - start
+        assert store.count() == args.submissions
+        store.close()
+
+    latencies.sort()
+    n = args.submissions
+    print(f"submissions:              {n}")
+    print(f"submit() p50 / p99:       {statistics.median(latencies) * 1e6:.1f} / {latencies[int(n * 0.99)] * 1e6:.1f} us")
+    print(f"enqueue rate:             {n / enqueued:,.0f} submissions/s")
+    print(f"persisted rate:           {n / persisted:,.0f} submissions/s")
+
+
+if __name__ == "__main__":
+    main()
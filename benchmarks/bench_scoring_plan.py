@@ -0,0 +1,114 @@
+"""Scoring-plan running totals against calculate_scores, plus a randomized agreement check.
+
+Each simulated session answers a synthetic bank one question at a time, changing
+some answers along the way. The loop baseline re-scores everything with
+calculate_scores at submit; RunningTotals pays a small cost per answer and
+reads its totals at submit.
+Every session's totals (and ScoringPlan.score) must equal calculate_scores.
+
+Run: python benchmarks/bench_scoring_plan.py --questions 15 200 1000 --sessions 2000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scoring_plan import ScoringPlan
+from utils import QUESTIONS, calculate_scores
+
+CATEGORIES = ["Analytical", "Social", "Moral", "Symbolic", "Creative-Technical"]
+
+
+def synthetic_questions(n, rng):
+    questions = []
+    for i in range(n):
+        cat = CATEGORIES[i % len(CATEGORIES)]
+        kind = rng.random()
+        if kind < 0.6:
+            questions.append({"text": f" Statement {i}", "category": cat, "type": "likert"})
+        elif kind < 0.85:
+            options = rng.sample(range(1, 200), 4)
+            questions.append({"text": f" Sequence {i}", "category": cat, "type": "numeric_choice",
+                              "options": options, "correct": rng.choice(options)})
+        else:
+            options_1, options_2 = rng.sample(range(1, 200), 4), rng.sample(range(1, 200), 4)
+            questions.append({"text": f" Sequence {i}", "category": cat, "type": "numeric_choice_multi",
+                              "options_1": options_1, "options_2": options_2,
+                              "correct_1": rng.choice(options_1), "correct_2": rng.choice(options_2)})
+    return questions
+
+
+def random_answer(rng, q):
+    if rng.random() < 0.05:
+        return None
+    if q["type"] == "likert":
+        return rng.randint(1, 5)
+    if q["type"] == "numeric_choice":
+        return rng.choice(q["options"])
+    return (rng.choice(q["options_1"]), rng.choice(q["options_2"]))
+
+
+def answer_stream(rng, questions):
+    #(index, value) per answer event: every question once, then some revisits
+    events = [(i, random_answer(rng, q)) for i, q in enumerate(questions)]
+    for _ in range(len(questions) // 4):
+        i = rng.randrange(len(questions))
+        events.append((i, random_answer(rng, questions[i])))
+    return events
+
+
+def run(questions, sessions, rng):
+    plan = ScoringPlan(questions)
+    streams = [answer_stream(rng, questions) for _ in range(sessions)]
+
+    rescore_s = update_s = read_s = 0.0
+    updates = 0
+    for events in streams:
+        answers = {}
+        for i, value in events:
+            answers[f"q_{i}"] = value
+        start = time.perf_counter()
+        expected = calculate_scores(answers, questions)
+        rescore_s += time.perf_counter() - start
+
+        totals = plan.running_totals()
+        start = time.perf_counter()
+        for i, value in events:
+            totals.set(i, value)
+        update_s += time.perf_counter() - start
+        updates += len(events)
+        start = time.perf_counter()
+        got = totals.to_dict()
+        read_s += time.perf_counter() - start
+
+        assert got == expected, f"running totals {got} != calculate_scores {expected}"
+        assert plan.score(answers) == expected, "ScoringPlan.score differs from calculate_scores"
+    return rescore_s / sessions, read_s / sessions, update_s / updates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, nargs="+", default=[15, 200, 1000])
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    #The built-in bank first, with string and malformed answers mixed in
+    plan = ScoringPlan(QUESTIONS)
+    for value in (None, "3", "x", 32, "32", (98, 148), [98, 1], 5):
+        answers = {f"q_{i}": value for i in range(len(QUESTIONS))}
+        assert plan.score(answers) == calculate_scores(answers, QUESTIONS), f"built-in bank differs for {value!r}"
+
+    print(f"{'questions':>9}  {'submit: re-score (us)':>21}  {'submit: totals (us)':>19}  {'per answer (us)':>15}")
+    for n in args.questions:
+        rescore, read, update = run(synthetic_questions(n, rng), args.sessions, rng)
+        print(f"{n:>9}  {rescore * 1e6:>21.1f}  {read * 1e6:>19.2f}  {update * 1e6:>15.2f}")
+    print("all totals agree with calculate_scores")
+
+
+if __name__ == "__main__":
+    main()
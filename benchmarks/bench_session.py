@@ -0,0 +1,71 @@
+"""Per-session memory of session.CompactSession against the dict-based layout.
+
+The dict layout is what init_session_state used to allocate: separate user,
+answers ("q_<i>" keys), progress and scores containers plus one typed_<i> flag
+per question in session_state. Both layouts are filled as a finished test.
+
+Run: python benchmarks/bench_session.py --questions 15 1000 --sessions 500
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session import CompactSession
+
+USER = {"name": "Test Person", "age": 30, "gender": "Prefer not to say", "email": "test@example.com"}
+SCORES = {"Analytical": 9, "Social": 12, "Moral": 11, "Symbolic": 10, "Creative-Technical": 13}
+
+
+def dict_session(n):
+    state = {
+        "user": dict(USER),
+        "answers": {},
+        "progress": {"current_q": n - 1},
+        "scores": dict(SCORES),
+        "submitted": True,
+    }
+    for i in range(n):
+        state["answers"][f"q_{i}"] = (101, 175) if i % 7 == 2 else 1 + i % 5
+        state[f"typed_{i}"] = True
+    return state
+
+
+def compact_session(n):
+    session = CompactSession(n)
+    session.user.update(USER)
+    session.scores.update(SCORES)
+    session.current_q = n - 1
+    session.submitted = True
+    for i in range(n):
+        session.answers[f"q_{i}"] = (101, 175) if i % 7 == 2 else 1 + i % 5
+        session.mark_typed(i)
+    return session
+
+
+def per_session_bytes(build, n, sessions):
+    tracemalloc.start()
+    kept = [build(n) for _ in range(sessions)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(kept)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, nargs="+", default=[15, 1000])
+    parser.add_argument("--sessions", type=int, default=500)
+    args = parser.parse_args()
+
+    for n in args.questions:
+        legacy = per_session_bytes(dict_session, n, args.sessions)
+        compact = per_session_bytes(compact_session, n, args.sessions)
+        snapshot = len(compact_session(n).to_bytes())
+        print(f"{n:>5} questions: dict layout {legacy:>9,.0f} B, compact {compact:>8,.0f} B "
+              f"({legacy / compact:.1f}x smaller), serialized {snapshot:,} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Server-side cost of the question typing effect.
+
+Compares utils.typing_print_lines (one markdown delta per character, sleeps on
+the script thread) with utils.typing_print_html (one delta, animated in the
+browser) for every question in QUESTIONS.
+
+Run: python benchmarks/bench_typing.py
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils
+
+
+class _Recorder:
+    """Stand-in for the streamlit module that records markdown deltas."""
+
+    def __init__(self):
+        self.deltas = 0
+        self.bytes = 0
+
+    def empty(self):
+        return self
+
+    def markdown(self, body, **kwargs):
+        self.deltas += 1
+        self.bytes += len(body.encode("utf-8"))
+
+
+def measure(render, lines):
+    recorder = _Recorder()
+    slept = [0.0]
+    real_st, real_sleep = utils.st, utils.time.sleep
+    utils.st = recorder
+    utils.time.sleep = lambda s: slept.__setitem__(0, slept[0] + s)
+    try:
+        start = time.perf_counter()
+        render(lines)
+        cpu = time.perf_counter() - start
+    finally:
+        utils.st, utils.time.sleep = real_st, real_sleep
+    return {"deltas": recorder.deltas, "bytes": recorder.bytes, "cpu_s": cpu, "blocked_s": cpu + slept[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+
+    totals = {"server": {}, "client": {}}
+    print(f"{'q':>3} {'chars':>5} | {'server deltas':>13} {'bytes':>8} {'blocked s':>9} | {'client deltas':>13} {'bytes':>6} {'blocked s':>9}")
+    for i, q in enumerate(utils.QUESTIONS):
+        lines = q["text"].split("\n")
+        server = measure(utils.typing_print_lines, lines)
+        client = measure(utils.typing_print_html, lines)
+        for mode, result in (("server", server), ("client", client)):
+            for k, v in result.items():
+                totals[mode][k] = totals[mode].get(k, 0) + v
+        print(
+            f"{i:>3} {len(q['text']):>5} | {server['deltas']:>13} {server['bytes']:>8} {server['blocked_s']:>9.3f}"
+            f" | {client['deltas']:>13} {client['bytes']:>6} {client['blocked_s']:>9.5f}"
+        )
+    n = len(utils.QUESTIONS)
+    for mode in ("server", "client"):
+        t = totals[mode]
+        print(
+            f"{mode:>6}: {t['deltas'] / n:.1f} deltas, {t['bytes'] / n:.0f} bytes and "
+            f"{t['blocked_s'] / n * 1000:.2f} ms of script-thread time per question"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""Micro-benchmarks for the utils.py hot paths, checked against stored baselines.
+
+Cases: calculate_scores across bank sizes, generate_certificate_bytes for short
+and long names and many categories (certificate cache cleared every call),
+init_session_state against a stand-in for st.session_state/st.query_params, and
+the per-character cost of typing_print_lines with sleeps stubbed out.
+
+Each case reports the best per-call (or per-character) time over --repeat runs,
+interleaved with a fixed calibration workload. A case regresses when its time
+relative to the calibration is slower than its baseline by more than the tolerance
+(--tolerance, or a per-case "tolerance" in the baseline file); any regression
+makes the run exit with status 1. Baselines are machine-specific: record them on
+the machine that runs the check with --update-baseline.
+
+Run: python benchmarks/bench_utils.py --output bench_utils.json
+     python benchmarks/bench_utils.py --update-baseline
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import time
+import timeit
+import types
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils
+from checkpoint import CheckpointStore, MemoryBackend
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_utils_baseline.json")
+CATEGORIES = ["Analytical", "Social", "Moral", "Symbolic", "Creative-Technical"]
+
+
+def synthetic_questions(n, rng):
+    questions = []
+    for i in range(n):
+        cat = CATEGORIES[i % len(CATEGORIES)]
+        if i % 5 == 0:
+            options = rng.sample(range(1, 200), 4)
+            questions.append({"text": f" Sequence {i}", "category": cat, "type": "numeric_choice",
+                              "options": options, "correct": options[0]})
+        elif i % 7 == 0:
+            options_1, options_2 = rng.sample(range(1, 200), 4), rng.sample(range(1, 200), 4)
+            questions.append({"text": f" Sequence {i}", "category": cat, "type": "numeric_choice_multi",
+                              "options_1": options_1, "options_2": options_2,
+                              "correct_1": options_1[0], "correct_2": options_2[0]})
+        else:
+            questions.append({"text": f" Statement {i}", "category": cat, "type": "likert"})
+    return questions
+
+
+def filled_answers(questions, rng):
+    answers = {}
+    for i, q in enumerate(questions):
+        if q["type"] == "likert":
+            answers[f"q_{i}"] = rng.randint(1, 5)
+        elif q["type"] == "numeric_choice":
+            answers[f"q_{i}"] = rng.choice(q["options"])
+        else:
+            answers[f"q_{i}"] = (rng.choice(q["options_1"]), rng.choice(q["options_2"]))
+    return answers
+
+
+class _SessionState(dict):
+    #Attribute access like st.session_state
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+
+class _Placeholder:
+    __slots__ = ("text",)
+
+    def markdown(self, text):
+        self.text = text
+
+
+def _fake_st():
+    return types.SimpleNamespace(session_state=_SessionState(), query_params={}, empty=_Placeholder)
+
+
+def _patched(**attrs):
+    #Patch utils attributes for a whole measurement, outside the timed calls
+    patches = [mock.patch.object(utils, name, value) for name, value in attrs.items()]
+    stack = contextlib.ExitStack()
+    for patch in patches:
+        stack.enter_context(patch)
+    return stack
+
+
+def scoring_cases(rng):
+    cases = {}
+    for n in (15, 200, 1000):
+        questions = synthetic_questions(n, rng)
+        answers = filled_answers(questions, rng)
+        cases[f"calculate_scores[{n}]"] = (lambda a=answers, q=questions: utils.calculate_scores(a, q), 1, None)
+    return cases
+
+
+def certificate_cases():
+    scores = {cat: 10 for cat in CATEGORIES}
+    many = {f"Category {i}": i for i in range(40)}
+    variants = {
+        "short_name": ("Ann Lee", scores),
+        "long_name": ("Maximiliana Alexandrina Wilhelmina von Hohenzollern-Sigmaringen " * 2, scores),
+        "many_categories": ("Ann Lee", many),
+    }
+    cases = {}
+    for label, (name, cat_scores) in variants.items():
+        def run(name=name, cat_scores=cat_scores):
+            #Clear the rendered-PDF cache so every call renders
+            utils._render_certificate.cache_clear()
+            utils.generate_certificate_bytes(name, cat_scores)
+        cases[f"generate_certificate_bytes[{label}]"] = (run, 1, None)
+    return cases
+
+
+def session_cases():
+    store = CheckpointStore(MemoryBackend(), interval=0)
+    token = "benchmark-resume-token-0001"
+    session = utils.CompactSession(15)
+    session.answers["q_0"] = 3
+    store.save(token, session.to_bytes())
+    store.flush()
+    fake = _fake_st()
+    context = lambda: _patched(st=fake, get_checkpoint_store=lambda: store)
+
+    def new_session():
+        fake.session_state, fake.query_params = _SessionState(), {}
+        utils.init_session_state(15)
+
+    def rerun():
+        #Session already in session_state, as on every rerun after the first
+        utils.init_session_state(15)
+
+    def resume():
+        fake.session_state, fake.query_params = _SessionState(), {"resume": token}
+        utils.init_session_state(15)
+
+    return {
+        "init_session_state[new]": (new_session, 1, context),
+        "init_session_state[rerun]": (rerun, 1, context),
+        "init_session_state[resume]": (resume, 1, context),
+    }
+
+
+def typing_cases():
+    lines = [
+        " What number comes next in the sequence: 2, 4, 8, 16, ?",
+        " Pick the option that best completes the pattern.",
+    ]
+    chars = sum(len(line) for line in lines)
+    context = lambda: _patched(st=_fake_st(), time=types.SimpleNamespace(sleep=lambda seconds: None))
+    return {"typing_print_lines[per_char]": (lambda: utils.typing_print_lines(lines), chars, context)}
+
+
+def build_cases(seed):
+    rng = random.Random(seed)
+    cases = {}
+    cases.update(scoring_cases(rng))
+    cases.update(certificate_cases())
+    cases.update(session_cases())
+    cases.update(typing_cases())
+    return cases
+
+
+def _calibration_work():
+    #Fixed pure-Python workload measured next to every case; timings are compared
+    #in units of it, so a slower or busier machine does not read as a regression
+    table = {}
+    total = 0
+    for i in range(1000):
+        table[f"k{i}"] = i
+        total += table[f"k{i}"] % 7
+    return total
+
+
+def _number(timer, min_time):
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return number
+
+
+def measure(func, units, repeat, min_time):
+    """
+    Returns: (best seconds per unit, best seconds per calibration run) over
+    `repeat` interleaved runs of at least min_time each
+    """
+    timer, calibration = timeit.Timer(func), timeit.Timer(_calibration_work)
+    number, calibration_number = _number(timer, min_time), _number(calibration, min_time)
+    best = calibration_best = float("inf")
+    for _ in range(repeat):
+        calibration_best = min(calibration_best, calibration.timeit(calibration_number) / calibration_number)
+        best = min(best, timer.timeit(number) / number)
+    return best / units, calibration_best
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["cases"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed slowdown over the baseline (0.5 = 50%% slower)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per timed run")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--update-baseline", action="store_true", help="store these timings as the new baseline")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    results = []
+    for name, (func, units, context) in build_cases(args.seed).items():
+        if args.filter not in name:
+            continue
+        with context() if context else contextlib.nullcontext():
+            seconds, calibration = measure(func, units, args.repeat, args.min_time)
+        base = baseline.get(name, {})
+        tolerance = base.get("tolerance", args.tolerance)
+        #Compare calibration-relative speed, not wall-clock seconds
+        ratio = (seconds / calibration) / (base["seconds"] / base["calibration"]) if "calibration" in base else None
+        regressed = ratio is not None and ratio > 1 + tolerance
+        results.append({
+            "name": name,
+            "seconds": seconds,
+            "calibration": calibration,
+            "baseline": base.get("seconds"),
+            "ratio": ratio,
+            "tolerance": tolerance,
+            "regressed": regressed,
+        })
+        status = "REGRESSED" if regressed else ("new" if ratio is None else "ok")
+        shown = "-" if ratio is None else f"{ratio:.2f}x"
+        print(f"{name:<42} {seconds * 1e6:>12.2f} us  {shown:>7}  {status}")
+
+    report = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        cases = dict(baseline)
+        for r in results:
+            entry = {"seconds": r["seconds"], "calibration": r["calibration"]}
+            if "tolerance" in baseline.get(r["name"], {}):
+                entry["tolerance"] = baseline[r["name"]]["tolerance"]
+            cases[r["name"]] = entry
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"python": report["python"], "platform": report["platform"], "cases": cases}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    regressions = [r["name"] for r in results if r["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Headless concurrent load test for IQ_TEST.py.
+
+Each synthetic user runs the app through streamlit.testing.v1.AppTest: register,
+step through every question with Next (going Back once), submit, open Results
+and download the certificate, rendered again without the PDF cache so its cost
+shows up as its own "certificate" step. AppTest drives a process-wide mock runtime, so users
+run in parallel worker processes, each one simulating its users back to back.
+Reports reruns/sec, p50/p95/p99 latency per interaction and peak RSS, and writes
+everything to a JSON file so runs can be compared across releases.
+
+Run: python benchmarks/load_test.py --users 50 --concurrency 10 --output load_test.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "IQ_TEST.py")
+sys.path.insert(0, ROOT)
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def _timed_run(at, timings, interaction):
+    start = time.perf_counter()
+    at.run()
+    timings.append((interaction, time.perf_counter() - start))
+    if at.exception:
+        raise RuntimeError(f"{interaction}: {at.exception[0].value}")
+    return at
+
+
+def _button(at, label):
+    return next(b for b in at.button if b.label == label)
+
+
+def simulate_user(user_id, timeout):
+    """Returns: (list of (interaction, seconds), peak RSS of this worker in MB, error or None)"""
+    from streamlit.testing.v1 import AppTest
+
+    timings = []
+    main_module = sys.modules["__main__"]
+    try:
+        _walk_app(AppTest.from_file(APP, default_timeout=timeout), user_id, timings)
+        error = None
+    except Exception as exc:
+        error = f"user {user_id}: {exc!r}"
+    finally:
+        #AppTest installs the app script as __main__; restore it so this worker can take more users
+        sys.modules["__main__"] = main_module
+    return timings, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, error
+
+
+def _walk_app(at, user_id, timings):
+    _timed_run(at, timings, "open")
+
+    at.sidebar.selectbox[0].select("Register")
+    _timed_run(at, timings, "navigate")
+    at.text_input[0].input(f"Load User {user_id}")
+    at.text_input[1].input(f"user{user_id}@example.com")
+    at.button[0].click()
+    _timed_run(at, timings, "register")
+
+    at.sidebar.selectbox[0].select("Test")
+    _timed_run(at, timings, "navigate")
+    went_back = False
+    while not at.session_state["session"].submitted:
+        if not went_back and at.session_state["session"].current_q == 1:
+            went_back = True
+            _button(at, "Back").click()
+            _timed_run(at, timings, "back")
+        _button(at, "Next").click()
+        _timed_run(at, timings, "next")
+
+    at.sidebar.selectbox[0].select("Results")
+    _timed_run(at, timings, "results")
+    downloads = at.get("download_button")
+    if not downloads:
+        raise RuntimeError("Results page has no certificate download")
+    _download_certificate(at, timings)
+
+
+def _download_certificate(at, timings):
+    #The Results rerun filled the PDF cache; render this user's certificate again
+    #without it, as the first Results visit does, and time that on its own
+    import utils
+
+    session = at.session_state["session"]
+    utils._render_certificate.cache_clear()
+    start = time.perf_counter()
+    pdf = utils.generate_certificate_bytes(session.user.get("name", "Tester"), session.scores)
+    timings.append(("certificate", time.perf_counter() - start))
+    if not pdf.startswith(b"%PDF"):
+        raise RuntimeError("certificate download is not a PDF")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds allowed per rerun")
+    parser.add_argument("--output", default="load_test.json")
+    args = parser.parse_args()
+
+    #Keep the harness's submissions out of the real results store and norms
+    tmp = tempfile.mkdtemp(prefix="iq_load_test_")
+    os.environ.setdefault("IQ_RESULTS_DB", os.path.join(tmp, "results.db"))
+    os.environ.setdefault("IQ_NORMS", os.path.join(tmp, "norms.json"))
+    os.environ.setdefault("IQ_CHECKPOINTS", "memory://")
+
+    by_interaction = {}
+    errors = []
+    peak_rss_mb = 0.0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [pool.submit(simulate_user, i, args.timeout) for i in range(args.users)]
+        for future in futures:
+            timings, rss_mb, error = future.result()
+            for interaction, seconds in timings:
+                by_interaction.setdefault(interaction, []).append(seconds)
+            peak_rss_mb = max(peak_rss_mb, rss_mb)
+            if error:
+                errors.append(error)
+    elapsed = time.perf_counter() - start
+
+    #The certificate step is timed outside the script, so it is not a rerun
+    reruns = sum(len(v) for name, v in by_interaction.items() if name != "certificate")
+    report = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "users": args.users,
+        "concurrency": args.concurrency,
+        "completed_users": args.users - len(errors),
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "reruns": reruns,
+        "reruns_per_s": reruns / elapsed,
+        "peak_rss_mb": peak_rss_mb,
+        "latency_ms": {
+            name: {
+                "count": len(values),
+                "p50": percentile(values, 50) * 1000,
+                "p95": percentile(values, 95) * 1000,
+                "p99": percentile(values, 99) * 1000,
+            }
+            for name, values in sorted(by_interaction.items())
+        },
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{report['completed_users']}/{args.users} users in {elapsed:.1f} s, "
+          f"{report['reruns_per_s']:.1f} reruns/s, peak worker RSS {report['peak_rss_mb']:.0f} MB")
+    for name, stats in report["latency_ms"].items():
+        print(f"  {name:<12} n={stats['count']:<5} p50={stats['p50']:.1f} ms  p95={stats['p95']:.1f} ms  p99={stats['p99']:.1f} ms")
+    for error in errors[:5]:
+        print(f"  error: {error}")
+    print(f"report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Load test for scoring_api over keep-alive HTTP/1.1 connections.
+
+Opens --connections concurrent connections to a running server (or spawns one
+with --spawn) and sends --requests requests in total, reporting requests/sec
+and p50/p95/p99 latency.
+
+Run: python benchmarks/load_test_api.py --spawn --requests 20000 --connections 64
+     python benchmarks/load_test_api.py --port 8000 --endpoint certificate --requests 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def score_payload(rng):
+    answers = {f"q_{i}": rng.randint(1, 5) for i in range(15) if i not in (0, 2)}
+    answers["q_0"] = rng.choice([32, 34, 36, 40])
+    answers["q_2"] = [rng.choice([92, 98, 101, 105]), rng.choice([148, 161, 175, 180])]
+    return {"answers": answers}
+
+
+def build_request(host, endpoint, payload):
+    body = json.dumps(payload).encode()
+    head = (f"POST /{endpoint} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n")
+    return head.encode() + body
+
+
+async def connection(host, port, requests, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for request in requests:
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            status = int(head.split(b" ", 2)[1])
+            length = next(
+                int(line.split(b":", 1)[1]) for line in head.split(b"\r\n") if line.lower().startswith(b"content-length")
+            )
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(args):
+    rng = random.Random(0)
+    requests = []
+    for i in range(args.requests):
+        payload = score_payload(rng)
+        if args.endpoint == "certificate":
+            payload["name"] = f"Partner User {i}"
+        requests.append(build_request(args.host, args.endpoint, payload))
+    per_conn = [requests[i::args.connections] for i in range(args.connections)]
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(connection(args.host, args.port, reqs, latencies, errors) for reqs in per_conn if reqs))
+    return time.perf_counter() - start, sorted(latencies), errors
+
+
+def wait_for_server(host, port, timeout=30):
+    import socket
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f"server on {host}:{port} did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--endpoint", choices=("score", "certificate"), default="score")
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--spawn", action="store_true", help="start scoring_api on --port for the run")
+    parser.add_argument("--server-workers", type=int, default=1)
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen(
+            [sys.executable, "scoring_api.py", "--port", str(args.port), "--workers", str(args.server_workers)],
+            cwd=ROOT, stderr=subprocess.DEVNULL,
+        )
+        wait_for_server(args.host, args.port)
+    try:
+        elapsed, latencies, errors = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000
+
+    print(f"{len(latencies)} /{args.endpoint} requests over {args.connections} connections in {elapsed:.2f} s")
+    print(f"throughput: {len(latencies) / elapsed:,.0f} requests/s, errors: {len(errors)}")
+    print(f"latency:    p50 {pct(50):.2f} ms, p95 {pct(95):.2f} ms, p99 {pct(99):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Minimal local SMTP server that accepts and counts messages.
+
+A stand-in for a real mail server when testing email_delivery; aiosmtpd or
+`python -m smtpd` work too. fail_every=N rejects every Nth RCPT with a
+temporary 451 error to exercise retries.
+
+Run: python benchmarks/smtp_sink.py --port 8025
+"""
+import argparse
+import socketserver
+import threading
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address=("127.0.0.1", 0), fail_every=0):
+        super().__init__(address, _SMTPHandler)
+        self.fail_every = fail_every
+        self.messages = 0
+        self.connections = 0
+        self.rejected = 0
+        self._rcpts = 0
+        self._lock = threading.Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name="smtp-sink", daemon=True).start()
+        return self
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server._lock:
+            server.connections += 1
+        self.reply("220 localhost smtp-sink ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 localhost")
+            elif command.startswith("RCPT"):
+                with server._lock:
+                    server._rcpts += 1
+                    reject = server.fail_every and server._rcpts % server.fail_every == 0
+                    server.rejected += bool(reject)
+                self.reply("451 try again later" if reject else "250 OK")
+            elif command == "DATA":
+                self.reply("354 end data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                with server._lock:
+                    server.messages += 1
+                self.reply("250 OK queued")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                #MAIL, RSET, NOOP and anything else
+                self.reply("250 OK")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--fail-every", type=int, default=0)
+    args = parser.parse_args()
+    sink = SMTPSink(("127.0.0.1", args.port), fail_every=args.fail_every)
+    print(f"SMTP sink listening on 127.0.0.1:{sink.port}")
+    sink.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
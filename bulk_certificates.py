@@ -0,0 +1,163 @@
+"""Render certificates for a whole cohort from a results file.
+
+The results file is CSV (a "name" column plus one column per category) or JSON
+lines ({"name": ..., "scores": {category: score}}). PDFs are rendered with
+utils.generate_certificate_bytes across a process pool and streamed into a ZIP
+archive or a directory as they finish, so memory stays flat however large the
+cohort is.
+
+Usage:
+    python bulk_certificates.py results.csv --zip certificates.zip
+    python bulk_certificates.py results.jsonl --out-dir certificates/ --workers 32
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+
+def read_results(path, skipped=None):
+    """
+    Yield (name, scores) rows from a CSV or JSON lines results file.
+    skipped: optional list; rows that cannot be read are left out and
+        recorded there as (line number, reason) instead of stopping the run
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line_num, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                    yield _result_row(row["name"], row["scores"].items())
+                except (ValueError, TypeError, KeyError, AttributeError) as exc:
+                    _skip(skipped, line_num, exc)
+        else:
+            reader = csv.DictReader(f)
+            for row in reader:
+                try:
+                    if None in row:
+                        raise ValueError(f"{len(row[None])} more value(s) than columns")
+                    if None in row.values():
+                        raise ValueError("fewer values than columns")
+                    yield _result_row(row.pop("name"), row.items())
+                except (ValueError, TypeError, KeyError) as exc:
+                    _skip(skipped, reader.line_num, exc)
+
+
+def _result_row(name, score_items):
+    if not isinstance(name, str):
+        raise TypeError("'name' must be a string")
+    return name, {cat: float(val) for cat, val in score_items}
+
+
+def _skip(skipped, line_num, exc):
+    reason = f"missing {exc}" if isinstance(exc, KeyError) else str(exc) or type(exc).__name__
+    if skipped is not None:
+        skipped.append((line_num, reason))
+
+
+def certificate_filename(index, name):
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "_", name).strip("_") or "Tester"
+    return f"{index:06d}_IQ_Certificate_{slug}.pdf"
+
+
+def _render_batch(jobs):
+    from utils import generate_certificate_bytes
+
+    return [(certificate_filename(i, name), generate_certificate_bytes(name, scores)) for i, name, scores in jobs]
+
+
+def _batches(rows, size):
+    batch = []
+    for i, (name, scores) in enumerate(rows):
+        batch.append((i, name, scores))
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def render_certificates(rows, workers=None, batch_size=16, window=None):
+    """
+    rows: iterable of (name, scores)
+    workers: process count (defaults to os.cpu_count())
+    batch_size: certificates rendered per task, to amortize inter-process overhead
+    window: maximum batches in flight; bounds memory regardless of cohort size
+    Yields: (filename, pdf_bytes) in input order
+    """
+    workers = workers or os.cpu_count() or 1
+    window = window or workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for batch in _batches(rows, batch_size):
+            pending.append(pool.submit(_render_batch, batch))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class _Progress:
+    def __init__(self, stream=sys.stderr, every=1.0):
+        self.stream = stream
+        self.every = every
+        self.start = self.last = time.perf_counter()
+        self.done = 0
+
+    def tick(self):
+        self.done += 1
+        now = time.perf_counter()
+        if now - self.last >= self.every:
+            self.last = now
+            self.report()
+
+    def report(self, final=False):
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        end = "\n" if final else "\r"
+        self.stream.write(f"{self.done} certificates, {self.done / elapsed:,.1f} pages/s, {elapsed:.1f} s{end}")
+        self.stream.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render certificates for a cohort of results.")
+    parser.add_argument("results", help="CSV or JSON lines results file")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--zip", help="write all PDFs into this ZIP archive")
+    target.add_argument("--out-dir", help="write PDFs into this directory")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=16, help="certificates per worker task")
+    args = parser.parse_args(argv)
+
+    progress = _Progress()
+    skipped = []
+    rows = read_results(args.results, skipped)
+    certificates = render_certificates(rows, workers=args.workers, batch_size=args.batch_size)
+    if args.zip:
+        #PDF streams are already compressed, so store them as-is
+        with zipfile.ZipFile(args.zip, "w", compression=zipfile.ZIP_STORED) as archive:
+            for filename, pdf in certificates:
+                archive.writestr(filename, pdf)
+                progress.tick()
+    else:
+        os.makedirs(args.out_dir, exist_ok=True)
+        for filename, pdf in certificates:
+            with open(os.path.join(args.out_dir, filename), "wb") as f:
+                f.write(pdf)
+            progress.tick()
+    progress.report(final=True)
+    for line_num, reason in skipped:
+        sys.stderr.write(f"skipped {args.results}:{line_num}: {reason}\n")
+    if skipped:
+        sys.stderr.write(f"{len(skipped)} row(s) skipped\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+import atexit
+import logging
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+#Session checkpoints: CompactSession snapshots keyed by a resume token from the URL,
+#so a test survives a reconnect or landing on another replica. save() only
+#records the latest snapshot per token; a background thread writes them.
+#Backends follow the Redis get/set(ex=)/delete subset, so redis.Redis works as is.
+
+#Checkpoints expire after this many seconds unless saved again
+DEFAULT_TTL = 7 * 24 * 3600
+
+_TOKEN = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    token TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    expires_at REAL
+);
+"""
+
+
+def new_token():
+    """Returns: a fresh unguessable resume token"""
+    return secrets.token_urlsafe(16)
+
+
+def is_token(value):
+    return isinstance(value, str) and _TOKEN.match(value) is not None
+
+
+class SQLiteBackend:
+    """Checkpoints in a local SQLite file (WAL mode); replicas on one host can share it."""
+
+    def __init__(self, path, purge_interval=60.0):
+        self.path = path
+        self.purge_interval = purge_interval
+        self._last_purge = 0.0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(SCHEMA)
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM checkpoints WHERE token = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def set(self, key, value, ex=None):
+        self.set_many({key: value}, ex=ex)
+
+    def set_many(self, items, ex=None):
+        """Write several checkpoints in one transaction."""
+        now = time.time()
+        expires_at = now + ex if ex else None
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO checkpoints (token, data, expires_at) VALUES (?, ?, ?)",
+                [(key, value, expires_at) for key, value in items.items()],
+            )
+            if now - self._last_purge >= self.purge_interval:
+                self._conn.execute("DELETE FROM checkpoints WHERE expires_at <= ?", (now,))
+                self._last_purge = now
+
+    def delete(self, *keys):
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM checkpoints WHERE token = ?", [(key,) for key in keys])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class MemoryBackend:
+    """
+    In-process stand-in for a Redis server with the same get/set(ex=)/delete calls.
+    latency: seconds added to every call, to stand in for a network round trip
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value, ex=None):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self._data[key] = (bytes(value), time.time() + ex if ex else None)
+        return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+
+def open_backend(url):
+    """
+    url: "memory://", "redis://host:port/db" (needs the redis package), or a
+        SQLite path, optionally written "sqlite:///path"
+    Returns: a checkpoint backend
+    """
+    if url.startswith("memory://"):
+        return MemoryBackend()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        import redis
+
+        return redis.Redis.from_url(url)
+    if url.startswith("sqlite:///"):
+        url = url[len("sqlite:///"):]
+    return SQLiteBackend(os.path.expanduser(url))
+
+
+class CheckpointStore:
+    """
+    Latest-snapshot-wins checkpoint writer. save() stores the snapshot in a
+    pending map and returns; a background thread writes whatever is pending,
+    so several saves of one session between writes cost a single backend write.
+    """
+
+    def __init__(self, backend, ttl=DEFAULT_TTL, interval=0.05):
+        """interval: seconds between batch writes, so bursts coalesce into one write"""
+        self.backend = backend
+        self.ttl = ttl
+        self.interval = interval
+        self.stats = {"saved": 0, "written": 0, "coalesced": 0, "failed": 0}
+        self._pending = {}
+        self._inflight = {}
+        self._closed = False
+        self._cond = threading.Condition()
+        self._writer = threading.Thread(target=self._write_loop, name="checkpoint-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def save(self, token, data):
+        """Queue the snapshot for token; returns immediately."""
+        with self._cond:
+            if token in self._pending:
+                self.stats["coalesced"] += 1
+            self._pending[token] = data
+            self.stats["saved"] += 1
+            #flush() waits on the same condition; notify() could wake a flusher instead of the writer
+            self._cond.notify_all()
+
+    def load(self, token):
+        """Returns: the newest snapshot for token (including unwritten ones), or None"""
+        with self._cond:
+            data = self._pending.get(token, self._inflight.get(token))
+        if data is not None:
+            return data
+        try:
+            return self.backend.get(token)
+        except Exception:
+            logger.exception("failed to read checkpoint")
+            return None
+
+    def flush(self, timeout=None):
+        """Block until every saved snapshot has been written; Returns: True if it finished in time"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._inflight, timeout)
+
+    def close(self, timeout=None):
+        """Write what is still pending and stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join(timeout)
+
+    def _write_loop(self):
+        last_write = 0.0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                #Let more saves collect until the interval since the last write is over
+                wait = last_write + self.interval - time.monotonic()
+                if wait > 0:
+                    self._cond.wait_for(lambda: self._closed, wait)
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+            try:
+                self._write(batch)
+                written, failed = len(batch), 0
+            except Exception:
+                logger.exception("failed to write %d checkpoints", len(batch))
+                written, failed = 0, len(batch)
+            last_write = time.monotonic()
+            with self._cond:
+                self._inflight = {}
+                self.stats["written"] += written
+                self.stats["failed"] += failed
+                self._cond.notify_all()
+
+    def _write(self, batch):
+        ex = int(self.ttl) if self.ttl else None
+        set_many = getattr(self.backend, "set_many", None)
+        if set_many is not None:
+            set_many(batch, ex=ex)
+            return
+        pipeline = getattr(self.backend, "pipeline", None)
+        if pipeline is not None:
+            #Redis client: one round trip for the whole batch
+            pipe = pipeline(transaction=False)
+            for token, data in batch.items():
+                pipe.set(token, data, ex=ex)
+            pipe.execute()
+            return
+        for token, data in batch.items():
+            self.backend.set(token, data, ex=ex)
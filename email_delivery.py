@@ -0,0 +1,199 @@
+import atexit
+import heapq
+import itertools
+import logging
+import queue
+import random
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+
+logger = logging.getLogger(__name__)
+
+
+def _is_permanent(exc):
+    """Returns: True for failures a retry cannot fix (5xx replies, unsupported features)"""
+    if isinstance(exc, smtplib.SMTPNotSupportedError):
+        return True
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(500 <= code < 600 for code, _ in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 500 <= exc.smtp_code < 600
+    return False
+
+
+def _recipient(msg):
+    return msg["To"] if isinstance(msg, EmailMessage) else msg[0]
+
+
+class EmailQueue:
+    """
+    Background certificate mailer. enqueue() only queues; a pool of worker
+    threads sends in batches, each worker reusing one SMTP connection until it
+    has been idle for idle_timeout seconds. Failed sends are retried with
+    exponential backoff and dropped after max_retries attempts.
+    """
+
+    def __init__(self, host, port=25, sender="no-reply@localhost", username=None, password=None,
+                 starttls=False, workers=2, batch_size=20, max_retries=5, backoff=1.0,
+                 idle_timeout=30.0, timeout=10.0):
+        self.host, self.port, self.sender = host, port, sender
+        self.username, self.password, self.starttls = username, password, starttls
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.sent = self.failed = self.retried = 0
+
+        self._queue = queue.Queue()
+        self._retries = []
+        self._order = itertools.count()
+        self._lock = threading.Condition()
+        self._pending = 0
+        self._closing = False
+        self._workers = [
+            threading.Thread(target=self._work, name=f"email-worker-{i}", daemon=True) for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        atexit.register(self.close, 10.0)
+
+    def enqueue(self, to, subject, body, attachment=None, filename="certificate.pdf"):
+        """Queue one message; returns immediately (the MIME message is built by a worker)."""
+        with self._lock:
+            self._pending += 1
+        self._queue.put(((to, subject, body, attachment, filename), 0))
+
+    def _build_message(self, to, subject, body, attachment, filename):
+        msg = EmailMessage()
+        msg["From"], msg["To"], msg["Subject"] = self.sender, to, subject
+        msg.set_content(body)
+        if attachment is not None:
+            msg.add_attachment(attachment, maintype="application", subtype="pdf", filename=filename)
+        return msg
+
+    def flush(self, timeout=None):
+        """Block until every queued message was sent or dropped; returns False on timeout."""
+        with self._lock:
+            return self._lock.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, timeout=None):
+        """Finish queued sends (waiting up to timeout seconds) and stop the workers."""
+        if self._closing:
+            return
+        self.flush(timeout)
+        self._closing = True
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout)
+
+    def _connect(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password)
+        return smtp
+
+    def _next_batch(self, wait):
+        """Returns: up to batch_size (message, attempts) pairs, waiting at most `wait` seconds for the first"""
+        self._release_due_retries()
+        try:
+            first = self._queue.get(timeout=wait)
+        except queue.Empty:
+            return []
+        batch = [first]
+        #Stop at a shutdown marker so every worker gets its own
+        while len(batch) < self.batch_size and batch[-1] is not None:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _release_due_retries(self):
+        now = time.monotonic()
+        with self._lock:
+            while self._retries and self._retries[0][0] <= now:
+                _, _, item = heapq.heappop(self._retries)
+                self._queue.put(item)
+
+    def _retry_wait(self):
+        with self._lock:
+            if not self._retries:
+                return self.idle_timeout
+            return max(0.0, min(self.idle_timeout, self._retries[0][0] - time.monotonic()))
+
+    def _finish(self, sent):
+        with self._lock:
+            if sent:
+                self.sent += 1
+            else:
+                self.failed += 1
+            self._pending -= 1
+            self._lock.notify_all()
+
+    def _schedule_retry(self, msg, attempts):
+        if attempts >= self.max_retries:
+            logger.error("giving up on email to %s after %d attempts", msg["To"], attempts)
+            self._finish(False)
+            return
+        delay = self.backoff * 2 ** (attempts - 1) * random.uniform(0.8, 1.2)
+        with self._lock:
+            self.retried += 1
+            heapq.heappush(self._retries, (time.monotonic() + delay, next(self._order), (msg, attempts)))
+
+    def _work(self):
+        smtp = None
+        last_used = time.monotonic()
+        while True:
+            batch = self._next_batch(self._retry_wait())
+            if not batch:
+                #Idle: drop the connection rather than hold it open
+                if smtp is not None and time.monotonic() - last_used >= self.idle_timeout:
+                    self._quit(smtp)
+                    smtp = None
+                continue
+            for item in batch:
+                if item is None:
+                    if smtp is not None:
+                        self._quit(smtp)
+                    return
+                msg, attempts = item
+                try:
+                    if not isinstance(msg, EmailMessage):
+                        msg = self._build_message(*msg)
+                    if smtp is None:
+                        smtp = self._connect()
+                    smtp.send_message(msg)
+                    self._finish(True)
+                except (smtplib.SMTPException, OSError) as exc:
+                    logger.warning("email to %s failed (attempt %d): %s", msg["To"], attempts + 1, exc)
+                    #A rejected message leaves the connection usable; anything else reconnects
+                    rejected = isinstance(exc, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused))
+                    if smtp is not None and not rejected:
+                        self._quit(smtp)
+                        smtp = None
+                    if _is_permanent(exc):
+                        logger.error("dropping email to %s: permanent failure: %s", msg["To"], exc)
+                        self._finish(False)
+                    else:
+                        self._schedule_retry(msg, attempts + 1)
+                except Exception:
+                    #A message that cannot be built or encoded; drop it, keep the worker alive
+                    logger.exception("dropping email to %s: cannot be sent", _recipient(msg))
+                    if smtp is not None:
+                        self._quit(smtp)
+                        smtp = None
+                    self._finish(False)
+                last_used = time.monotonic()
+
+    @staticmethod
+    def _quit(smtp):
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
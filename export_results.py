@@ -0,0 +1,174 @@
+"""Stream stored results to CSV or Parquet for analysis.
+
+Rows come from results_store.iter_results() in keyset-paged batches and are
+written in fixed-size chunks (Parquet row groups), so memory stays bounded no
+matter how many results are stored.
+
+Usage:
+    python export_results.py results.csv
+    python export_results.py results.parquet --since 2026-01-01 --until 2026-07-01 --category Analytical
+"""
+import argparse
+import csv
+import os
+from datetime import datetime, timezone
+from itertools import islice
+
+from question_bank import QuestionBank
+from results_store import iter_results
+
+USER_FIELDS = ("name", "age", "gender", "email")
+
+
+def _timestamp(value):
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, tz=timezone.utc).isoformat()
+
+
+def _parse_date(text):
+    value = datetime.fromisoformat(text)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def export_columns(questions, categories=None):
+    """
+    questions: question dicts in bank order
+    categories: optional categories to keep; answers and scores of others are dropped
+    Returns: (column names, [(answer key, part or None, bank answer key or None)], [category])
+    Numeric items get a "_key" column after each answer column holding the
+    correct answer that respondent saw (generated items differ per session).
+    """
+    keep = set(categories) if categories else {q["category"] for q in questions}
+    answer_columns, names = [], ["submitted_at", "started_at", *(f"user_{f}" for f in USER_FIELDS)]
+    for i, q in enumerate(questions):
+        if q["category"] not in keep:
+            continue
+        if q["type"] == "numeric_choice_multi":
+            for part, key in enumerate(("correct_1", "correct_2")):
+                answer_columns.append((f"q_{i}", part, q.get(key)))
+                names += [f"q_{i}_{part + 1}", f"q_{i}_{part + 1}_key"]
+        elif q["type"] == "numeric_choice":
+            answer_columns.append((f"q_{i}", None, q.get("correct")))
+            names += [f"q_{i}", f"q_{i}_key"]
+        else:
+            answer_columns.append((f"q_{i}", None, None))
+            names.append(f"q_{i}")
+    score_columns = [c for c in dict.fromkeys(q["category"] for q in questions) if c in keep]
+    names += [f"score_{c}" for c in score_columns]
+    return names, answer_columns, score_columns
+
+
+def export_rows(results, answer_columns, score_columns):
+    """Yields: one flat row (list) per stored result"""
+    for result in results:
+        user, answers, scores = result["user"], result["answers"], result["scores"]
+        #Results stored before keys were recorded fall back to the bank's keys
+        keys = result.get("answer_keys") or {}
+        row = [_timestamp(result["submitted_at"]), _timestamp(result["started_at"])]
+        row += [user.get(f) for f in USER_FIELDS]
+        for key, part, bank_key in answer_columns:
+            value = answers.get(key)
+            if part is not None:
+                value = value[part] if isinstance(value, list) else None
+            row.append(value)
+            if bank_key is not None:
+                correct = keys.get(key)
+                if part is not None:
+                    correct = correct[part] if isinstance(correct, list) else None
+                row.append(bank_key if correct is None else correct)
+        row += [scores.get(c) for c in score_columns]
+        yield row
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def write_csv(path, names, chunks):
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(names)
+        for chunk in chunks:
+            writer.writerows(chunk)
+            count += len(chunk)
+    return count
+
+
+def _double(value):
+    #Stored values that are not numbers (e.g. strings from an older schema) become null
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _column(pa, values, field):
+    try:
+        return pa.array(values, type=field.type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        if field.type != pa.float64():
+            raise
+        return pa.array([_double(v) for v in values], type=field.type)
+
+
+def write_parquet(path, names, chunks):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet export needs pyarrow: pip install pyarrow") from None
+
+    #Answers and scores can mix ints, floats and missing values, so store them as doubles
+    text = {"submitted_at", "started_at", "user_name", "user_gender", "user_email"}
+    schema = pa.schema([(n, pa.string() if n in text else pa.float64()) for n in names])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            columns = list(zip(*chunk))
+            writer.write_batch(pa.record_batch(
+                [_column(pa, col, field) for col, field in zip(columns, schema)], schema=schema
+            ))
+            count += len(chunk)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export stored results to CSV or Parquet.")
+    parser.add_argument("output", help="output file; .parquet writes Parquet, anything else CSV")
+    parser.add_argument("--db", default=os.environ.get("IQ_RESULTS_DB", "results.db"), help="results database")
+    parser.add_argument("--questions", default=os.environ.get("IQ_QUESTION_BANK", ""),
+                        help="question bank file (defaults to the built-in questions)")
+    parser.add_argument("--since", help="only results submitted on or after this ISO date/time")
+    parser.add_argument("--until", help="only results submitted before this ISO date/time")
+    parser.add_argument("--category", action="append",
+                        help="export only this category's answer and score columns; every result is still"
+                             " exported (repeatable)")
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="rows per write / Parquet row group")
+    args = parser.parse_args(argv)
+
+    if args.questions:
+        questions = QuestionBank.load(args.questions).questions
+    else:
+        from utils import QUESTIONS as questions
+
+    names, answer_columns, score_columns = export_columns(questions, args.category)
+    results = iter_results(
+        args.db,
+        since=_parse_date(args.since) if args.since else None,
+        until=_parse_date(args.until) if args.until else None,
+        batch_size=args.chunk_size,
+    )
+    chunks = chunked(export_rows(results, answer_columns, score_columns), args.chunk_size)
+    write = write_parquet if args.output.endswith(".parquet") else write_csv
+    count = write(args.output, names, chunks)
+    print(f"exported {count} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
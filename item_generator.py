@@ -0,0 +1,148 @@
+"""Procedural numeric-sequence items, generated ahead of time into seeded pools.
+
+Each rule family builds a sequence, its missing terms and near-miss distractors.
+build_pool() validates every item; get_pool() memoizes pools per process, so a
+session only picks from a prebuilt tuple (pick_item is O(1)).
+
+Usage:
+    python item_generator.py pools.json --size 200 --seed 7
+"""
+import argparse
+import json
+import random
+from functools import lru_cache
+
+
+def _geometric(rng):
+    start, ratio = rng.randint(1, 60), rng.randint(2, 5)
+    seq = [start * ratio ** k for k in range(5)]
+    return seq[:4], seq[4:]
+
+
+def _polynomial(rng):
+    c0, c1, c2 = rng.randint(1, 10), rng.randint(-3, 6), rng.randint(1, 4)
+    seq = [c0 + c1 * k + c2 * k * k for k in range(6)]
+    return seq[:5], seq[5:]
+
+
+def _difference_of_differences(rng):
+    #First differences grow by an arithmetic second difference, e.g. 3, 8, 18, 35, 61
+    value, diff, second, step = rng.randint(1, 10), rng.randint(1, 8), rng.randint(1, 6), rng.randint(1, 3)
+    seq = [value]
+    for _ in range(6):
+        diff += second
+        second += step
+        value += diff
+        seq.append(value)
+    return seq[:5], seq[5:]
+
+
+#family -> (sequence builder, question type)
+FAMILIES = {
+    "geometric": (_geometric, "numeric_choice"),
+    "polynomial": (_polynomial, "numeric_choice"),
+    "difference_of_differences": (_difference_of_differences, "numeric_choice_multi"),
+}
+
+
+def _distractors(rng, shown, answer, count=3):
+    last_diff = shown[-1] - shown[-2]
+    second_diff = last_diff - (shown[-2] - shown[-3])
+    candidates = {
+        answer + last_diff, answer - last_diff, answer + second_diff, answer - second_diff,
+        shown[-1] + last_diff, answer + 1, answer - 1, answer + 2, 2 * shown[-1],
+    }
+    candidates = sorted(c for c in candidates if c > 0 and c != answer)
+    rng.shuffle(candidates)
+    return candidates[:count]
+
+
+def _options(rng, shown, answer):
+    options = _distractors(rng, shown, answer) + [answer]
+    rng.shuffle(options)
+    return options
+
+
+def generate_item(family, rng, category="Analytical"):
+    """Returns: one question dict of the family's type, with its correct answer(s)"""
+    build, q_type = FAMILIES[family]
+    shown, missing = build(rng)
+    terms = ", ".join(str(n) for n in shown)
+    item = {"category": category, "type": q_type, "generator": family, "sequence": shown}
+    if q_type == "numeric_choice":
+        item["text"] = f" If a pattern is {terms}, what comes next?"
+        item["options"] = _options(rng, shown, missing[0])
+        item["correct"] = missing[0]
+    else:
+        item["text"] = f" The series has numbers {terms}, __, __. Find the missing two."
+        item["options_1"] = _options(rng, shown, missing[0])
+        item["options_2"] = _options(rng, shown + [missing[0]], missing[1])
+        item["correct_1"], item["correct_2"] = missing
+    return item
+
+
+def validate_item(item):
+    """Raises ValueError unless every option list is unique, has 4 entries and holds its answer."""
+    if item["type"] == "numeric_choice":
+        pairs = [(item["options"], item["correct"])]
+    else:
+        pairs = [(item["options_1"], item["correct_1"]), (item["options_2"], item["correct_2"])]
+    for options, correct in pairs:
+        if len(options) != 4 or len(set(options)) != 4 or correct not in options:
+            raise ValueError(f"invalid generated item: {item}")
+
+
+def build_pool(family, size, seed, category="Analytical"):
+    """
+    Returns: tuple of `size` validated items with distinct sequences, the same for
+    the same (family, size, seed)
+    """
+    rng = random.Random(f"{family}:{seed}")
+    items, seen = [], set()
+    attempts = 0
+    while len(items) < size:
+        attempts += 1
+        if attempts > size * 50:
+            raise ValueError(f"family '{family}' cannot produce {size} distinct items")
+        item = generate_item(family, rng, category)
+        key = tuple(item["sequence"])
+        try:
+            validate_item(item)
+        except ValueError:
+            continue
+        if key not in seen:
+            seen.add(key)
+            items.append(item)
+    return tuple(items)
+
+
+@lru_cache(maxsize=None)
+def get_pool(family, size, seed):
+    """Per-process memoized build_pool()."""
+    return build_pool(family, size, seed)
+
+
+def pick_item(pool, session_seed, position):
+    """Returns: the pool item for a session's question position; O(1), stable per session"""
+    return pool[(session_seed * 1_000_003 + position) % len(pool)]
+
+
+def load_pools(path):
+    """Returns: {family: tuple of items} from a file written by this module's CLI"""
+    with open(path, encoding="utf-8") as f:
+        return {family: tuple(items) for family, items in json.load(f).items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prebuild numeric-sequence item pools.")
+    parser.add_argument("output", help="JSON file to write")
+    parser.add_argument("--size", type=int, default=200, help="items per family")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    pools = {family: build_pool(family, args.size, args.seed) for family in FAMILIES}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(pools, f)
+
+
+if __name__ == "__main__":
+    main()
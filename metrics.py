@@ -0,0 +1,176 @@
+import atexit
+import bisect
+import cProfile
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+#Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; observe() is a bisect and three additions."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def cumulative(self):
+        """Returns: list of (upper bound, cumulative count), ending with ('+Inf', count)"""
+        total, out = 0, []
+        for bound, n in zip(self.buckets + ("+Inf",), self.counts):
+            total += n
+            out.append((bound, total))
+        return out
+
+
+class Metrics:
+    """
+    In-process rerun timings keyed by (page, phase), exported every interval
+    seconds to path as Prometheus text, or as JSON lines when path ends in .jsonl.
+    A profile_rate fraction of reruns also run under cProfile, with stats
+    written to profile_dir.
+    """
+
+    def __init__(self, path=None, interval=15.0, profile_rate=0.0, profile_dir=None):
+        self.path = path
+        self.interval = interval
+        self.profile_rate = profile_rate
+        self.profile_dir = profile_dir or tempfile.gettempdir()
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._exporter = None
+        if path:
+            self._exporter = threading.Thread(target=self._export_loop, name="metrics-exporter", daemon=True)
+            self._exporter.start()
+            atexit.register(self.close)
+
+    def observe(self, page, phase, seconds):
+        with self._lock:
+            histogram = self._histograms.get((page, phase))
+            if histogram is None:
+                histogram = self._histograms[(page, phase)] = Histogram()
+            histogram.observe(seconds)
+
+    def start_rerun(self, page):
+        return RerunTimer(self, page)
+
+    def snapshot(self):
+        """Returns: {(page, phase): (cumulative buckets, sum, count)}"""
+        with self._lock:
+            return {key: (h.cumulative(), h.sum, h.count) for key, h in self._histograms.items()}
+
+    def prometheus_text(self):
+        lines = [
+            "# HELP iq_rerun_seconds Streamlit script rerun time by page and phase.",
+            "# TYPE iq_rerun_seconds histogram",
+        ]
+        for (page, phase), (buckets, total, count) in sorted(self.snapshot().items()):
+            labels = f'page="{page}",phase="{phase}"'
+            for bound, n in buckets:
+                lines.append(f'iq_rerun_seconds_bucket{{{labels},le="{bound}"}} {n}')
+            lines.append(f"iq_rerun_seconds_sum{{{labels}}} {total}")
+            lines.append(f"iq_rerun_seconds_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+    def json_lines(self):
+        now = time.time()
+        return "".join(
+            json.dumps({
+                "ts": now,
+                "page": page,
+                "phase": phase,
+                "count": count,
+                "sum": total,
+                "buckets": {str(bound): n for bound, n in buckets},
+            }) + "\n"
+            for (page, phase), (buckets, total, count) in sorted(self.snapshot().items())
+        )
+
+    def export(self):
+        if self.path.endswith(".jsonl"):
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(self.json_lines())
+            return
+        #Replace the whole file so a scraper never reads a partial export
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        #mkstemp creates the file 0600; a textfile collector may run as another user
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, self.path)
+
+    def _export_loop(self):
+        while not self._stop.wait(self.interval):
+            self.export()
+
+    def close(self):
+        if self._exporter is None or self._stop.is_set():
+            return
+        self._stop.set()
+        self._exporter.join()
+        self.export()
+
+
+class RerunTimer:
+    """
+    Times one script rerun and its phases; finish() records the total. Used as
+    a context manager it finishes on exit, including on exceptions.
+    """
+
+    def __init__(self, metrics, page):
+        self.metrics = metrics
+        self.page = page
+        self.start = time.perf_counter()
+        self.finished = False
+        self.profiler = None
+        if metrics.profile_rate and random.random() < metrics.profile_rate:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.finish()
+        return False
+
+    def finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        self.metrics.observe(self.page, "total", time.perf_counter() - self.start)
+        if self.profiler is not None:
+            self.profiler.disable()
+            name = f"rerun-{self.page}-{time.time_ns()}.prof"
+            self.profiler.dump_stats(os.path.join(self.metrics.profile_dir, name))
+
+
+class _Phase:
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.metrics.observe(self.timer.page, self.name, time.perf_counter() - self.start)
+        return False
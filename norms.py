@@ -0,0 +1,217 @@
+import atexit
+import bisect
+import json
+import logging
+import os
+import tempfile
+import threading
+from array import array
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    #Windows: saves from several processes are not serialized
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class NormTable:
+    """
+    Per-category score distributions kept sorted, so percentile lookups are a
+    bisect instead of a scan over stored results. Updated incrementally with
+    add() and serializable with save()/load().
+
+    The results store is the source of truth: the saved table covers exactly the
+    stored results up to last_id, so tables saved by different processes only
+    differ in how far they got, and the one that got further wins.
+    """
+
+    def __init__(self):
+        self._scores = {}
+        self._totals = {}
+        #Id of the newest stored result folded into the table
+        self.last_id = 0
+        #(submitted_at, scores) added by this process but not read back from the store yet
+        self._provisional = []
+        self._lock = threading.Lock()
+
+    def _insert(self, scores):
+        for cat, val in scores.items():
+            bisect.insort(self._scores.setdefault(cat, array("d")), float(val))
+            self._totals[cat] = self._totals.get(cat, 0.0) + float(val)
+
+    def add(self, scores, submitted_at):
+        """
+        Count a test submitted in this process right away, before the results
+        store has written it; update_from_results() skips it when it shows up there.
+        scores: dict {category: score} of one submitted test
+        """
+        with self._lock:
+            self._insert(scores)
+            self._provisional.append((submitted_at, scores))
+
+    def count(self, category):
+        return len(self._scores.get(category, ()))
+
+    def percentile(self, category, value):
+        """
+        Returns: percentage of stored scores in category below value, counting
+        ties as half (None when the category has no scores yet)
+        """
+        values = self._scores.get(category)
+        if not values:
+            return None
+        below = bisect.bisect_left(values, value)
+        at_or_below = bisect.bisect_right(values, value)
+        return 100.0 * (below + at_or_below) / (2 * len(values))
+
+    def average(self, category):
+        n = self.count(category)
+        return self._totals[category] / n if n else None
+
+    def update_from_results(self, results):
+        """
+        Fold in stored results (dicts from ResultsStore.iter_results) newer than
+        last_id; results this process already added count once. Adaptive runs
+        are left out: their scores are estimates, not sums over every item.
+        """
+        for result in results:
+            with self._lock:
+                if result["id"] <= self.last_id:
+                    continue
+                self.last_id = result["id"]
+                if result.get("abilities") is not None:
+                    continue
+                entry = (result["submitted_at"], result["scores"])
+                if entry in self._provisional:
+                    self._provisional.remove(entry)
+                else:
+                    self._insert(result["scores"])
+
+    def to_dict(self):
+        """Returns: the stored results part of the table (provisional adds left out)"""
+        with self._lock:
+            scores = {cat: list(values) for cat, values in self._scores.items()}
+            for _, provisional in self._provisional:
+                for cat, val in provisional.items():
+                    values = scores[cat]
+                    del values[bisect.bisect_left(values, float(val))]
+            return {"last_id": self.last_id, "scores": scores}
+
+    @classmethod
+    def from_dict(cls, data):
+        table = cls()
+        if "last_id" not in data:
+            #Saved before tables tracked store ids; rebuilt from the store instead
+            return table
+        table.last_id = data["last_id"]
+        for cat, values in data["scores"].items():
+            table._scores[cat] = array("d", sorted(values))
+            table._totals[cat] = float(sum(values))
+        return table
+
+    def save(self, path):
+        """
+        Write the table unless the file at path already covers as many stored
+        results (saved by another process that got further). The check and the
+        replace happen under a lock on path + ".lock".
+        Returns: True if the file was written
+        """
+        data = self.to_dict()
+        directory = os.path.dirname(os.path.abspath(path))
+        with _locked(path):
+            if os.path.exists(path) and _saved_last_id(path) >= data["last_id"]:
+                return False
+            #Write to a temporary file first so readers never see a half-written table
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path)
+        return True
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def load_table(path):
+    """
+    Returns: the table saved at path, or an empty one when the file is missing
+    or unreadable; NormSync then rebuilds it from the results store
+    """
+    if not os.path.exists(path):
+        return NormTable()
+    try:
+        return NormTable.load(path)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        logger.exception("unreadable norm table %s; rebuilding it from the results store", path)
+        return NormTable()
+
+
+@contextmanager
+def _locked(path):
+    if fcntl is None:
+        yield
+        return
+    with open(path + ".lock", "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _saved_last_id(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get("last_id", 0)
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+class NormSync:
+    """
+    Keeps a NormTable in step with the results store from a background thread:
+    reads the stored results it has not seen yet right away, then again and
+    saves the table every interval seconds, and once more on close().
+    """
+
+    def __init__(self, table, read_results, path, interval=60.0):
+        """read_results: callable(after_id) yielding stored results newer than after_id"""
+        self.table = table
+        self.read_results = read_results
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="norms-sync", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def sync(self):
+        """Fold in new stored results and save the table."""
+        self.table.update_from_results(self.read_results(self.table.last_id))
+        self.table.save(self.path)
+
+    def close(self):
+        """Stop the thread after a last sync."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        self._sync_logged()
+
+    def _sync_logged(self):
+        try:
+            self.sync()
+        except Exception:
+            logger.exception("failed to update norm table %s", self.path)
+
+    def _loop(self):
+        while True:
+            self._sync_logged()
+            if self._stop.wait(self.interval):
+                return
@@ -0,0 +1,118 @@
+import json
+import os
+import sqlite3
+
+from item_generator import FAMILIES
+from session import UNSET
+
+#Required keys per question type, on top of text/category/type
+QUESTION_TYPES = {
+    "likert": (),
+    "numeric_choice": ("options",),
+    "numeric_choice_multi": ("options_1", "options_2"),
+}
+
+#Answer-key field and the options list it must come from, per question type
+ANSWER_KEYS = {
+    "numeric_choice": (("correct", "options"),),
+    "numeric_choice_multi": (("correct_1", "options_1"), ("correct_2", "options_2")),
+}
+
+
+class QuestionBankError(ValueError):
+    """Raised when a question bank file is missing fields or has bad values."""
+
+
+def validate_question(q, position):
+    """Check one question dict; raises QuestionBankError on the first problem."""
+    if not isinstance(q, dict):
+        raise QuestionBankError(f"question {position}: expected an object, got {type(q).__name__}")
+    for key in ("text", "category", "type"):
+        if not isinstance(q.get(key), str) or not q[key].strip():
+            raise QuestionBankError(f"question {position}: '{key}' must be a non-empty string")
+    if q["type"] not in QUESTION_TYPES:
+        raise QuestionBankError(f"question {position}: unknown type '{q['type']}'")
+    if "generator" in q:
+        #Sessions get items from a prebuilt pool; the fixed options and key below are
+        #still required, for scoring without a session (API, batch re-scoring)
+        family = FAMILIES.get(q["generator"])
+        if family is None:
+            raise QuestionBankError(f"question {position}: unknown generator '{q['generator']}'")
+        if family[1] != q["type"]:
+            raise QuestionBankError(f"question {position}: generator '{q['generator']}' makes {family[1]} items")
+    for key in QUESTION_TYPES[q["type"]]:
+        options = q.get(key)
+        if not isinstance(options, list) or not options:
+            raise QuestionBankError(f"question {position}: '{key}' must be a non-empty list")
+        #Answers are stored in CompactSession's int32 slots (UNSET marks an empty one)
+        if not all(isinstance(o, int) and not isinstance(o, bool) and UNSET < o < 2 ** 31 for o in options):
+            raise QuestionBankError(f"question {position}: '{key}' must only contain 32-bit integers")
+    #Answer key: the scoring plan compares the chosen option with it
+    for key, options in ANSWER_KEYS.get(q["type"], ()):
+        if q.get(key) not in q[options]:
+            raise QuestionBankError(f"question {position}: '{key}' must be one of '{options}'")
+
+
+def read_questions(path):
+    """
+    path: JSON file (a list, or {"questions": [...]}) or SQLite database
+        (.db/.sqlite/.sqlite3) with a table questions(position INTEGER, data TEXT)
+        holding one JSON question object per row
+    Returns: list of question dicts in bank order
+    """
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            rows = conn.execute("SELECT data FROM questions ORDER BY position").fetchall()
+        finally:
+            conn.close()
+        return [json.loads(data) for (data,) in rows]
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["questions"] if isinstance(data, dict) else data
+
+
+class QuestionBank:
+    """
+    Validated, read-only question bank with lookups by category and type.
+    One instance is shared by every session in the process, so callers must
+    not mutate the question dicts.
+    """
+
+    def __init__(self, questions, source=None, mtime=None):
+        questions = tuple(questions)
+        for position, q in enumerate(questions):
+            validate_question(q, position)
+        self.questions = questions
+        self.source = source
+        self.mtime = mtime
+        by_category, by_type = {}, {}
+        for i, q in enumerate(questions):
+            by_category.setdefault(q["category"], []).append(i)
+            by_type.setdefault(q["type"], []).append(i)
+        self.by_category = {cat: tuple(idx) for cat, idx in by_category.items()}
+        self.by_type = {t: tuple(idx) for t, idx in by_type.items()}
+        self.categories = tuple(self.by_category)
+
+    @classmethod
+    def load(cls, path):
+        mtime = os.stat(path).st_mtime_ns
+        return cls(read_questions(path), source=path, mtime=mtime)
+
+    def is_stale(self):
+        """True when the source file changed on disk since this bank was loaded."""
+        if self.source is None:
+            return False
+        try:
+            return os.stat(self.source).st_mtime_ns != self.mtime
+        except FileNotFoundError:
+            return False
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __getitem__(self, index):
+        return self.questions[index]
+
+    def __iter__(self):
+        return iter(self.questions)
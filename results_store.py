@@ -0,0 +1,176 @@
+import atexit
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    user TEXT NOT NULL,
+    answers TEXT NOT NULL,
+    scores TEXT NOT NULL,
+    answer_keys TEXT,
+    abilities TEXT
+);
+CREATE INDEX IF NOT EXISTS results_submitted_at ON results (submitted_at);
+"""
+
+#Columns added after the first schema, applied to existing databases on open
+MIGRATIONS = {
+    #Correct answers of the items this respondent saw; generated items differ per session
+    "answer_keys": "ALTER TABLE results ADD COLUMN answer_keys TEXT",
+    #Ability estimates of adaptive runs, whose scores are scaled up from fewer items
+    "abilities": "ALTER TABLE results ADD COLUMN abilities TEXT",
+}
+
+#Sentinel telling the writer thread to exit
+_STOP = object()
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _columns(conn):
+    return {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+
+
+class ResultsStore:
+    """
+    Durable store of submitted tests in SQLite (WAL mode).
+    submit() only enqueues; a background thread writes queued results in
+    batches, so callers never wait on disk I/O.
+    """
+
+    def __init__(self, path, batch_size=500):
+        self.path = path
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        conn = _connect(path)
+        conn.executescript(SCHEMA)
+        existing = _columns(conn)
+        with conn:
+            for column, ddl in MIGRATIONS.items():
+                if column not in existing:
+                    conn.execute(ddl)
+        conn.close()
+        self._writer = threading.Thread(target=self._write_loop, name="results-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def submit(self, user, answers, scores, started_at=None, submitted_at=None, answer_keys=None, abilities=None):
+        """
+        Queue one submitted test for writing; returns immediately.
+        answer_keys: optional {'q_<i>': correct answer} of the items this respondent saw
+        abilities: {category: [ability, standard error]} for an adaptive run, else None
+        """
+        self._queue.put((
+            submitted_at or time.time(),
+            started_at,
+            json.dumps(user),
+            json.dumps(answers),
+            json.dumps(scores),
+            json.dumps(answer_keys) if answer_keys is not None else None,
+            json.dumps(abilities) if abilities is not None else None,
+        ))
+
+    def flush(self):
+        """Block until every queued result has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Write everything still queued and stop the writer thread."""
+        if not self._writer.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._writer.join()
+
+    def _write_loop(self):
+        conn = _connect(self.path)
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [row for row in batch if row is not _STOP]
+            stop = len(rows) != len(batch)
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO results (submitted_at, started_at, user, answers, scores, answer_keys, abilities)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+            except sqlite3.Error:
+                logger.exception("failed to write %d results to %s", len(rows), self.path)
+            for _ in batch:
+                self._queue.task_done()
+        conn.close()
+
+    def count(self):
+        conn = _connect(self.path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        finally:
+            conn.close()
+
+    def iter_results(self, since=None, until=None, batch_size=1000, after_id=0):
+        """Yields: stored results, see iter_results()"""
+        return iter_results(self.path, since=since, until=until, batch_size=batch_size, after_id=after_id)
+
+
+def iter_results(path, since=None, until=None, batch_size=1000, after_id=0):
+    """
+    Read stored results without starting a writer.
+    since, until: optional submitted_at bounds (epoch seconds, until is exclusive)
+    after_id: only results stored after the one with this id
+    Yields: dicts with id, submitted_at, started_at, user, answers, scores,
+        answer_keys ({} for results stored before keys were recorded) and
+        abilities (None unless the run was adaptive), oldest first
+    """
+    query = "SELECT id, submitted_at, started_at, user, answers, scores, {added} FROM results WHERE id > ?"
+    params = []
+    if since is not None:
+        query += " AND submitted_at >= ?"
+        params.append(since)
+    if until is not None:
+        query += " AND submitted_at < ?"
+        params.append(until)
+    query += " ORDER BY id LIMIT ?"
+    conn = _connect(path)
+    try:
+        #Read-only callers may open a database written before the migrated columns existed
+        existing = _columns(conn)
+        query = query.format(added=", ".join(c if c in existing else "NULL" for c in MIGRATIONS))
+        last_id = after_id
+        while True:
+            rows = conn.execute(query, [last_id, *params, batch_size]).fetchall()
+            if not rows:
+                return
+            for row_id, submitted_at, started_at, user, answers, scores, answer_keys, abilities in rows:
+                yield {
+                    "id": row_id,
+                    "submitted_at": submitted_at,
+                    "started_at": started_at,
+                    "user": json.loads(user),
+                    "answers": json.loads(answers),
+                    "scores": json.loads(scores),
+                    "answer_keys": json.loads(answer_keys) if answer_keys else {},
+                    "abilities": json.loads(abilities) if abilities else None,
+                }
+            last_id = rows[-1][0]
+    finally:
+        conn.close()
@@ -0,0 +1,210 @@
+"""Headless scoring API for partner integrations (ASGI).
+
+Endpoints:
+    GET  /health        -> {"status": "ok", "questions": <bank size>}
+    POST /score         {"answers": {"q_0": 32, "q_1": 4, "q_2": [98, 148], ...}}
+                        -> {"scores": {category: score}}
+    POST /certificate   {"name": "Ada", "answers": {...}} or {"name": "Ada", "scores": {...}}
+                        -> application/pdf
+
+Answers use the bank's question positions: Likert items take 1-5, numeric items
+take the chosen option (a two-item list for multi-part items). PDFs are
+rendered in a process pool so the event loop never blocks.
+
+Usage:
+    python scoring_api.py --port 8000          (needs uvicorn)
+    uvicorn scoring_api:app --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from question_bank import QuestionBank
+from utils import QUESTIONS, calculate_scores, generate_certificate_bytes
+
+#Largest request body accepted, in bytes
+MAX_BODY = 256 * 1024
+
+#How often (seconds) the bank file's mtime is checked for a reload
+BANK_CHECK_INTERVAL = 1.0
+
+
+class ValidationError(ValueError):
+    """Raised when a request payload does not match the question bank."""
+
+
+def validate_answers(answers, questions):
+    """
+    answers: request answers keyed 'q_<position>'
+    questions: question dicts of the bank
+    Returns: answers in the form calculate_scores expects
+    """
+    if not isinstance(answers, dict):
+        raise ValidationError("'answers' must be an object")
+    normalized = {}
+    for key, value in answers.items():
+        try:
+            position = int(key[2:]) if key.startswith("q_") else -1
+        except ValueError:
+            position = -1
+        #Only canonical keys of existing positions; "q_-1" or "q_01" would score nothing
+        if not 0 <= position < len(questions) or key != f"q_{position}":
+            raise ValidationError(f"unknown question '{key}'")
+        q = questions[position]
+        if q["type"] == "likert":
+            if not isinstance(value, int) or isinstance(value, bool) or not 1 <= value <= 5:
+                raise ValidationError(f"'{key}' must be an integer from 1 to 5")
+            normalized[key] = value
+        elif q["type"] == "numeric_choice":
+            #bool is an int subclass: true would otherwise match option 1
+            if isinstance(value, bool) or value not in q["options"]:
+                raise ValidationError(f"'{key}' must be one of {q['options']}")
+            #Stored as the chosen option, like the Test page; scoring compares it with the key
+            normalized[key] = value
+        else:
+            if not isinstance(value, list) or len(value) != 2:
+                raise ValidationError(f"'{key}' must be a list of two numbers")
+            if any(isinstance(v, bool) for v in value) or (
+                value[0] not in q["options_1"] or value[1] not in q["options_2"]
+            ):
+                raise ValidationError(f"'{key}' must pick from {q['options_1']} and {q['options_2']}")
+            normalized[key] = (int(value[0]), int(value[1]))
+    return normalized
+
+
+def _validate_scores(scores, questions):
+    categories = {q["category"] for q in questions}
+    if not isinstance(scores, dict) or not scores:
+        raise ValidationError("'scores' must be a non-empty object")
+    for cat, val in scores.items():
+        if cat not in categories:
+            raise ValidationError(f"unknown category '{cat}'")
+        if not isinstance(val, (int, float)) or isinstance(val, bool):
+            raise ValidationError(f"score for '{cat}' must be a number")
+    return scores
+
+
+def _render_certificate(name, score_items):
+    return generate_certificate_bytes(name, dict(score_items))
+
+
+class ScoringAPI:
+    def __init__(self, bank_path=None, pdf_workers=None):
+        self.bank_path = bank_path
+        self.pdf_workers = pdf_workers
+        self._bank = None
+        self._checked = 0.0
+        self._pool = None
+
+    @property
+    def questions(self):
+        now = time.monotonic()
+        if self._bank is None:
+            self._bank = QuestionBank.load(self.bank_path) if self.bank_path else QuestionBank(QUESTIONS)
+        elif now - self._checked > BANK_CHECK_INTERVAL and self._bank.is_stale():
+            self._bank = QuestionBank.load(self.bank_path)
+        self._checked = now
+        return self._bank.questions
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        try:
+            status, content_type, body = await self._route(scope, receive)
+        except ValidationError as exc:
+            status, content_type, body = 400, "application/json", _json({"error": str(exc)})
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", content_type.encode()), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.questions
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._pool is not None:
+                    self._pool.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _route(self, scope, receive):
+        method, path = scope["method"], scope["path"]
+        if path == "/health" and method == "GET":
+            return 200, "application/json", _json({"status": "ok", "questions": len(self.questions)})
+        if path not in ("/score", "/certificate"):
+            return 404, "application/json", _json({"error": "not found"})
+        if method != "POST":
+            return 405, "application/json", _json({"error": "method not allowed"})
+
+        payload = await _read_json(receive)
+        questions = self.questions
+        if path == "/score":
+            answers = validate_answers(payload.get("answers"), questions)
+            return 200, "application/json", _json({"scores": calculate_scores(answers, questions)})
+
+        name = payload.get("name")
+        if not isinstance(name, str) or not name.strip() or len(name) > 200:
+            raise ValidationError("'name' must be a non-empty string of at most 200 characters")
+        if "scores" in payload:
+            scores = _validate_scores(payload["scores"], questions)
+        else:
+            scores = calculate_scores(validate_answers(payload.get("answers"), questions), questions)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.pdf_workers)
+        loop = asyncio.get_running_loop()
+        pdf = await loop.run_in_executor(self._pool, _render_certificate, name.strip(), tuple(scores.items()))
+        return 200, "application/pdf", pdf
+
+
+def _json(data):
+    return json.dumps(data).encode("utf-8")
+
+
+async def _read_json(receive):
+    body = bytearray()
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY:
+            raise ValidationError("request body too large")
+        if not message.get("more_body"):
+            break
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise ValidationError("request body must be JSON") from None
+    if not isinstance(payload, dict):
+        raise ValidationError("request body must be a JSON object")
+    return payload
+
+
+app = ScoringAPI(bank_path=os.environ.get("IQ_QUESTION_BANK") or None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the headless scoring API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="server processes")
+    args = parser.parse_args(argv)
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("scoring_api needs an ASGI server: pip install uvicorn") from None
+    uvicorn.run("scoring_api:app", host=args.host, port=args.port, workers=args.workers,
+                log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#Scoring plan: the answer key and a scorer per item, compiled once per question bank.
+#RunningTotals keeps per-category totals that update in O(1) as answers change,
+#so submitting reads precomputed totals instead of re-scoring every answer.
+
+
+def _same_number(value, key):
+    if value == key:
+        return True
+    try:
+        return float(value) == float(key)
+    except (TypeError, ValueError):
+        return False
+
+
+def _score_likert(value, key):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _score_choice(value, key):
+    return 1 if _same_number(value, key) else 0
+
+
+def _score_multi(value, key):
+    #One point per correctly chosen missing number
+    if not isinstance(value, (tuple, list)) or len(value) != 2:
+        return 0
+    return int(_same_number(value[0], key[0])) + int(_same_number(value[1], key[1]))
+
+
+SCORERS = {
+    "likert": _score_likert,
+    "numeric_choice": _score_choice,
+    "numeric_choice_multi": _score_multi,
+}
+
+
+def answer_key(q):
+    """Returns: the correct answer of q (a pair for numeric_choice_multi), or None for Likert items"""
+    if q["type"] == "numeric_choice":
+        return q.get("correct")
+    if q["type"] == "numeric_choice_multi":
+        return (q.get("correct_1"), q.get("correct_2"))
+    return None
+
+
+class ScoringPlan:
+    """
+    Per-item scorer, answer key and category slot for a list of questions.
+    Items with a "generator" get their key per session, passed to score_item().
+    """
+
+    def __init__(self, questions):
+        self.categories = list(dict.fromkeys(q["category"] for q in questions))
+        slots = {cat: i for i, cat in enumerate(self.categories)}
+        self.item_category = [slots[q["category"]] for q in questions]
+        self.scorers = [SCORERS[q["type"]] for q in questions]
+        self.keys = [answer_key(q) for q in questions]
+
+    def __len__(self):
+        return len(self.scorers)
+
+    def score_item(self, index, value, key=None):
+        if value is None:
+            return 0
+        return self.scorers[index](value, self.keys[index] if key is None else key)
+
+    def score(self, answers, keys=None):
+        """
+        answers: dict { 'q_0': value, ... }
+        keys: optional per-item answer keys overriding the compiled ones
+        Returns: dict {category: total_score}
+        """
+        totals = [0] * len(self.categories)
+        for i in range(len(self.scorers)):
+            totals[self.item_category[i]] += self.score_item(i, answers.get(f"q_{i}"), keys[i] if keys else None)
+        return dict(zip(self.categories, totals))
+
+    def running_totals(self):
+        return RunningTotals(self)
+
+
+class RunningTotals:
+    """Category totals kept current as individual answers are set."""
+
+    __slots__ = ("plan", "totals", "item_scores")
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.totals = [0] * len(plan.categories)
+        self.item_scores = [0] * len(plan)
+
+    def set(self, index, value, key=None):
+        """Score one answer and move its category total by the change; O(1)."""
+        new = self.plan.score_item(index, value, key)
+        self.totals[self.plan.item_category[index]] += new - self.item_scores[index]
+        self.item_scores[index] = new
+
+    def to_dict(self):
+        return dict(zip(self.plan.categories, self.totals))
@@ -0,0 +1,194 @@
+import json
+import random
+import struct
+import time
+import zlib
+from array import array
+from collections.abc import MutableMapping
+
+#Marks an answer slot that has not been answered
+UNSET = -(2 ** 31)
+
+#Serialized header: version, question count, current_q, current_section, submitted, started_at, seed
+_HEADER = struct.Struct("<BIIIBdI")
+_VERSION = 1
+
+
+class CompactSession:
+    """
+    Per-session test state in a few fixed-size buffers instead of a dict per
+    concern. Answers live in an int32 array with two slots per question (the
+    second one is only used by two-part answers), typed flags in a bitset.
+    `answers` and `progress` are dict-like views for existing callers.
+    """
+
+    __slots__ = (
+        "n", "values", "typed", "current_q", "current_section",
+        "submitted", "started_at", "seed", "user", "scores", "abilities", "totals", "_answers", "_progress",
+    )
+
+    def __init__(self, n_questions, started_at=None, seed=None):
+        self.n = n_questions
+        self.values = array("i", [UNSET]) * (2 * n_questions)
+        self.typed = bytearray((n_questions + 7) // 8)
+        self.current_q = 0
+        self.current_section = 0
+        self.submitted = False
+        self.started_at = started_at if started_at is not None else time.time()
+        #Picks this session's generated items from the shared pools
+        self.seed = seed if seed is not None else random.getrandbits(31)
+        self.user = {}
+        self.scores = {}
+        #{category: [ability, standard error]} of an adaptive run, None for a full-length one
+        self.abilities = None
+        #Running category totals; rebuilt from the answers, so not serialized
+        self.totals = None
+        self._answers = AnswerView(self)
+        self._progress = ProgressView(self)
+
+    @property
+    def answers(self):
+        return self._answers
+
+    @property
+    def progress(self):
+        return self._progress
+
+    def resize(self, n_questions):
+        """Grow the buffers when the question bank gets longer; existing answers are kept."""
+        if n_questions <= self.n:
+            return
+        self.values.extend(array("i", [UNSET]) * (2 * (n_questions - self.n)))
+        self.typed.extend(bytearray((n_questions + 7) // 8 - len(self.typed)))
+        self.n = n_questions
+
+    def is_typed(self, index):
+        return bool(self.typed[index >> 3] & (1 << (index & 7)))
+
+    def mark_typed(self, index):
+        self.typed[index >> 3] |= 1 << (index & 7)
+
+    def get_answer(self, index, default=None):
+        first, second = self.values[2 * index], self.values[2 * index + 1]
+        if first == UNSET:
+            return default
+        return first if second == UNSET else (first, second)
+
+    def set_answer(self, index, value):
+        if isinstance(value, (tuple, list)):
+            self.values[2 * index], self.values[2 * index + 1] = int(value[0]), int(value[1])
+        else:
+            self.values[2 * index], self.values[2 * index + 1] = int(value), UNSET
+
+    def clear_answer(self, index):
+        self.values[2 * index] = self.values[2 * index + 1] = UNSET
+
+    def to_bytes(self):
+        header = _HEADER.pack(
+            _VERSION, self.n, self.current_q, self.current_section, self.submitted, self.started_at, self.seed
+        )
+        extra = {"user": self.user, "scores": self.scores, "abilities": self.abilities}
+        extra = json.dumps(extra, separators=(",", ":")).encode("utf-8")
+        return zlib.compress(header + self.values.tobytes() + bytes(self.typed) + extra)
+
+    @classmethod
+    def from_bytes(cls, data):
+        data = zlib.decompress(data)
+        version, n, current_q, current_section, submitted, started_at, seed = _HEADER.unpack_from(data)
+        if version != _VERSION:
+            raise ValueError(f"unsupported session snapshot version {version}")
+        session = cls(n, started_at=started_at, seed=seed)
+        offset = _HEADER.size
+        session.values = array("i")
+        session.values.frombytes(data[offset:offset + 8 * n])
+        offset += 8 * n
+        session.typed = bytearray(data[offset:offset + (n + 7) // 8])
+        offset += (n + 7) // 8
+        extra = json.loads(data[offset:].decode("utf-8"))
+        session.current_q, session.current_section, session.submitted = current_q, current_section, bool(submitted)
+        session.user, session.scores = extra["user"], extra["scores"]
+        session.abilities = extra.get("abilities")
+        return session
+
+
+def _position(key):
+    if not (isinstance(key, str) and key.startswith("q_")):
+        raise KeyError(key)
+    try:
+        return int(key[2:])
+    except ValueError:
+        raise KeyError(key) from None
+
+
+class AnswerView(MutableMapping):
+    """The answers dict interface ({'q_0': value, ...}) over CompactSession's array."""
+
+    __slots__ = ("_session",)
+
+    def __init__(self, session):
+        self._session = session
+
+    def __getitem__(self, key):
+        i = _position(key)
+        if i >= self._session.n:
+            raise KeyError(key)
+        value = self._session.get_answer(i)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            i = _position(key)
+        except KeyError:
+            return default
+        return self._session.get_answer(i, default) if i < self._session.n else default
+
+    def __setitem__(self, key, value):
+        i = _position(key)
+        if i >= self._session.n:
+            self._session.resize(i + 1)
+        self._session.set_answer(i, value)
+
+    def __delitem__(self, key):
+        self[key]
+        self._session.clear_answer(_position(key))
+
+    def __iter__(self):
+        values = self._session.values
+        return (f"q_{i}" for i in range(self._session.n) if values[2 * i] != UNSET)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class ProgressView(MutableMapping):
+    """The progress dict interface ({'current_q': ..., 'current_section': ...}) over CompactSession."""
+
+    __slots__ = ("_session",)
+    _KEYS = ("current_q", "current_section")
+
+    def __init__(self, session):
+        self._session = session
+
+    def __getitem__(self, key):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self._session, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        setattr(self._session, key, int(value))
+
+    def __delitem__(self, key):
+        raise TypeError("progress fields cannot be deleted")
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
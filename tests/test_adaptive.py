@@ -0,0 +1,42 @@
+from adaptive import AdaptiveSession, ItemPool, item_response
+from session import CompactSession
+from utils import QUESTIONS, calculate_scores
+
+
+def _run(questions, answer):
+    adaptive = AdaptiveSession(ItemPool(questions), se_target=0.0)
+    answers = {}
+    item = adaptive.next_item()
+    while item is not None:
+        answers[f"q_{item}"] = answer(questions[item])
+        adaptive.record(item, item_response(questions[item], answers[f"q_{item}"]))
+        item = adaptive.next_item()
+    return adaptive, answers
+
+
+def test_full_length_scores_equal_observed_when_every_item_was_asked():
+    def answer(q):
+        if q["type"] == "likert":
+            return 4
+        if q["type"] == "numeric_choice":
+            return q["correct"]
+        return (q["correct_1"], q["correct_2"])
+
+    adaptive, answers = _run(QUESTIONS, answer)
+    observed = calculate_scores(answers, QUESTIONS)
+    assert adaptive.full_length_scores(observed) == {cat: round(v, 1) for cat, v in observed.items()}
+
+
+def test_full_length_scores_fill_in_unasked_items():
+    questions = [{"text": " ?", "category": "Social", "type": "likert"} for _ in range(10)]
+    adaptive = AdaptiveSession(ItemPool(questions))
+    adaptive.record(0, item_response(questions[0], 5))
+    scores = adaptive.full_length_scores({"Social": 5})
+    #Nine unasked Likert items each expected between 1 and 5, above the midpoint after a 5
+    assert 5 + 9 * 3 < scores["Social"] < 5 + 9 * 5
+
+
+def test_abilities_survive_a_checkpoint():
+    session = CompactSession(3)
+    session.abilities = {"Social": [0.25, 0.5]}
+    assert CompactSession.from_bytes(session.to_bytes()).abilities == {"Social": [0.25, 0.5]}
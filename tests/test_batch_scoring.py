@@ -0,0 +1,72 @@
+"""Batch re-scoring of stored results must match calculate_scores."""
+import numpy as np
+
+from batch_scoring import score_results
+from export_results import export_columns, export_rows
+from results_store import ResultsStore, iter_results
+from utils import QUESTIONS, calculate_scores
+
+
+def seen_questions(keys):
+    #The built-in bank as a respondent with these generated items saw it
+    questions = [dict(q) for q in QUESTIONS]
+    questions[0]["correct"] = keys["q_0"]
+    questions[2]["correct_1"], questions[2]["correct_2"] = keys["q_2"]
+    return questions
+
+
+def test_stored_answer_keys_rescore_like_the_session(tmp_path):
+    respondents = [
+        ({"q_0": 13056, "q_2": [109, 164]}, {"q_0": 13056, "q_1": 4, "q_2": [109, 170]}),
+        ({"q_0": 176, "q_2": [145, 221]}, {"q_0": 154, "q_1": 2, "q_2": [145, 221]}),
+    ]
+    store = ResultsStore(str(tmp_path / "results.db"))
+    expected = []
+    for keys, answers in respondents:
+        scores = calculate_scores(answers, seen_questions(keys))
+        store.submit({"name": "T"}, answers, scores, answer_keys=keys)
+        expected.append(scores)
+    store.close()
+
+    results = list(iter_results(str(tmp_path / "results.db")))
+    assert [r["answer_keys"] for r in results] == [keys for keys, _ in respondents]
+    categories, scores = score_results(results, QUESTIONS)
+    assert np.array_equal(scores, [[row[c] for c in categories] for row in expected])
+
+    names, answer_columns, score_columns = export_columns(QUESTIONS)
+    row = dict(zip(names, next(export_rows(results, answer_columns, score_columns))))
+    assert (row["q_0"], row["q_0_key"]) == (13056, 13056)
+    assert (row["q_2_2"], row["q_2_2_key"]) == (170, 164)
+
+
+def test_results_without_keys_fall_back_to_the_bank():
+    results = [{"answers": {"q_0": 32, "q_2": [98, 148]}}]
+    categories, scores = score_results(results, QUESTIONS)
+    assert scores[0, categories.index("Analytical")] == calculate_scores(results[0]["answers"], QUESTIONS)["Analytical"]
+
+
+ODD_VALUES = [None, "", "x", "3", "3.5", " 4", 2.0, 3.7, float("nan"), True, (1, 2), [98.0, 148.0],
+              ["98", "148"], [98], (98, 148, 1), 32, 32.0, "32", 98, 148]
+
+
+def test_odd_stored_answers_match_calculate_scores():
+    import random
+
+    from batch_scoring import answers_to_matrix, batch_calculate_scores
+
+    rng = random.Random(0)
+    cohort = [{f"q_{i}": rng.choice(ODD_VALUES) for i in range(len(QUESTIONS)) if rng.random() < 0.9}
+              for _ in range(500)]
+    #Plain-number columns take the fast conversion path; keep some of those too
+    cohort += [{f"q_{i}": rng.choice([1, 2.5, 5, 32, True]) for i in range(len(QUESTIONS))} for _ in range(50)]
+    categories, scores = batch_calculate_scores(answers_to_matrix(cohort, QUESTIONS), QUESTIONS)
+    expected = [[calculate_scores(a, QUESTIONS)[c] for c in categories] for a in cohort]
+    assert np.array_equal(scores, expected)
+
+
+def test_numeric_column_without_key_scores_zero():
+    from batch_scoring import answers_to_matrix, batch_calculate_scores
+
+    questions = [{"text": " ?", "category": "Analytical", "type": "numeric_choice", "options": [1, 2]}]
+    _, scores = batch_calculate_scores(answers_to_matrix([{"q_0": 1}], questions), questions)
+    assert scores.tolist() == [[0.0]] == [[calculate_scores({"q_0": 1}, questions)["Analytical"]]]
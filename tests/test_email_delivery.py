@@ -0,0 +1,41 @@
+import smtplib
+
+from email_delivery import EmailQueue
+
+
+class FakeSMTP:
+    def __init__(self, refuse=()):
+        self.sent = []
+        self.refuse = refuse
+
+    def send_message(self, msg):
+        if msg["To"] in self.refuse:
+            raise smtplib.SMTPRecipientsRefused({msg["To"]: (550, b"no such user")})
+        self.sent.append(msg["To"])
+
+    def quit(self):
+        pass
+
+
+def _queue(monkeypatch, smtp):
+    monkeypatch.setattr(EmailQueue, "_connect", lambda self: smtp)
+    return EmailQueue("localhost", workers=1, backoff=0.01)
+
+
+def test_unbuildable_message_does_not_stop_delivery(monkeypatch):
+    smtp = FakeSMTP()
+    mailer = _queue(monkeypatch, smtp)
+    mailer.enqueue("a@example.com\r\nBcc: b@example.com", "Subject", "body")
+    mailer.enqueue("c@example.com", "Subject", "body")
+    assert mailer.flush(5)
+    assert (mailer.sent, mailer.failed) == (1, 1)
+    assert smtp.sent == ["c@example.com"]
+    mailer.close(5)
+
+
+def test_permanent_refusal_is_not_retried(monkeypatch):
+    mailer = _queue(monkeypatch, FakeSMTP(refuse=("a@example.com",)))
+    mailer.enqueue("a@example.com", "Subject", "body")
+    assert mailer.flush(5)
+    assert (mailer.sent, mailer.failed, mailer.retried) == (0, 1, 0)
+    mailer.close(5)
@@ -0,0 +1,22 @@
+import pytest
+
+from export_results import main
+from results_store import ResultsStore
+from utils import QUESTIONS
+
+
+def test_parquet_export_nulls_non_numeric_cells(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    db = str(tmp_path / "results.db")
+    store = ResultsStore(db)
+    #Answers as an older schema might have stored them
+    store.submit({"name": "Ann", "age": "twenty"}, {"q_0": "abc", "q_1": [1, 2]}, {"Analytical": 1})
+    store.submit({"name": "Bo", "age": 30}, {"q_0": 3, "q_1": "2"}, {"Analytical": 2})
+    store.close()
+    out = str(tmp_path / "out.parquet")
+    main([out, "--db", db])
+    table = pq.read_table(out).to_pydict()
+    assert table["q_0"] == [None, 3.0]
+    assert table["q_1"] == [None, 2.0]
+    assert table["user_age"] == [None, 30.0]
+    assert table["user_name"] == ["Ann", "Bo"]
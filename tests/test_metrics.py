@@ -0,0 +1,25 @@
+import os
+import stat
+import sys
+
+import pytest
+
+from metrics import Metrics
+
+
+def test_rerun_timer_finishes_when_the_script_raises(tmp_path):
+    metrics = Metrics(profile_rate=1.0, profile_dir=str(tmp_path))
+    with pytest.raises(RuntimeError):
+        with metrics.start_rerun("Test"):
+            raise RuntimeError("page failed")
+    assert sys.getprofile() is None
+    assert metrics.snapshot()[("Test", "total")][2] == 1
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_prometheus_export_is_world_readable(tmp_path):
+    path = tmp_path / "iq.prom"
+    metrics = Metrics(path=str(path), interval=3600)
+    metrics.observe("Test", "total", 0.01)
+    metrics.close()
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
@@ -0,0 +1,78 @@
+import stat
+
+from norms import NormSync, NormTable, load_table
+from results_store import ResultsStore
+
+
+def _store(tmp_path, scores):
+    store = ResultsStore(str(tmp_path / "results.db"))
+    for i, value in enumerate(scores):
+        store.submit({"name": f"t{i}"}, {}, {"Analytical": value}, submitted_at=1000.0 + i)
+    store.flush()
+    return store
+
+
+def test_own_submit_counts_once(tmp_path):
+    store = _store(tmp_path, [1, 2])
+    table = NormTable()
+    table.update_from_results(store.iter_results())
+    table.add({"Analytical": 3}, 2000.0)
+    assert table.count("Analytical") == 3
+    #Not written yet: the saved table leaves it out
+    assert table.to_dict()["scores"]["Analytical"] == [1.0, 2.0]
+    store.submit({"name": "me"}, {}, {"Analytical": 3}, submitted_at=2000.0)
+    store.flush()
+    table.update_from_results(store.iter_results(after_id=table.last_id))
+    assert table.count("Analytical") == 3
+    assert table.to_dict() == {"last_id": 3, "scores": {"Analytical": [1.0, 2.0, 3.0]}}
+    store.close()
+
+
+def test_save_keeps_the_table_that_covers_more_results(tmp_path):
+    store = _store(tmp_path, [1, 2, 3])
+    path = str(tmp_path / "norms.json")
+    behind, ahead = NormTable(), NormTable()
+    behind.update_from_results(store.iter_results(until=1001.0))
+    ahead.update_from_results(store.iter_results())
+    assert ahead.save(path)
+    assert not behind.save(path)
+    assert NormTable.load(path).count("Analytical") == 3
+    assert stat.S_IMODE((tmp_path / "norms.json").stat().st_mode) == 0o644
+    store.close()
+
+
+def test_sync_tops_up_and_saves(tmp_path):
+    store = _store(tmp_path, [1, 2])
+    path = str(tmp_path / "norms.json")
+    #A table saved before store ids were tracked is rebuilt, not double counted
+    (tmp_path / "norms.json").write_text('{"last_submitted_at": 1001.0, "scores": {"Analytical": [1.0, 2.0]}}')
+    table = NormTable.load(path)
+    sync = NormSync(table, lambda after_id: store.iter_results(after_id=after_id), path, interval=3600)
+    store.submit({"name": "t2"}, {}, {"Analytical": 5}, submitted_at=1002.0)
+    store.flush()
+    sync.close()
+    assert table.count("Analytical") == 3
+    assert NormTable.load(path).to_dict() == {"last_id": 3, "scores": {"Analytical": [1.0, 2.0, 5.0]}}
+    store.close()
+
+
+def test_adaptive_results_stay_out_of_the_table(tmp_path):
+    store = _store(tmp_path, [1])
+    store.submit({"name": "a"}, {}, {"Analytical": 40}, submitted_at=2000.0, abilities={"Analytical": [1.5, 0.4]})
+    store.flush()
+    table = NormTable()
+    table.update_from_results(store.iter_results())
+    assert (table.count("Analytical"), table.last_id) == (1, 2)
+    store.close()
+
+
+def test_corrupt_table_is_rebuilt(tmp_path):
+    store = _store(tmp_path, [1, 2])
+    path = tmp_path / "norms.json"
+    path.write_text('{"last_id": 2, "scores": {"Analyt')
+    table = load_table(str(path))
+    assert (table.count("Analytical"), table.last_id) == (0, 0)
+    table.update_from_results(store.iter_results(after_id=table.last_id))
+    assert table.save(str(path))
+    assert NormTable.load(str(path)).count("Analytical") == 2
+    store.close()
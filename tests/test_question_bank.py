@@ -0,0 +1,40 @@
+"""Question bank validation guards what scoring and the compact session rely on."""
+import json
+
+import pytest
+
+from question_bank import QuestionBank, QuestionBankError
+from utils import QUESTIONS, calculate_scores
+
+
+def numeric(**fields):
+    return {"text": " 2, 4, 8, 16, ?", "category": "Analytical", "type": "numeric_choice"} | fields
+
+
+def test_builtin_bank_is_valid():
+    QuestionBank(QUESTIONS)
+
+
+def test_generator_question_needs_fixed_options_and_key(tmp_path):
+    path = tmp_path / "bank.json"
+    path.write_text(json.dumps([numeric(generator="geometric", options=[32, 34, 36, 40])]))
+    with pytest.raises(QuestionBankError, match="'correct'"):
+        QuestionBank.load(str(path))
+
+
+def test_generator_question_with_key_scores():
+    bank = QuestionBank([numeric(generator="geometric", options=[32, 34, 36, 40], correct=32)])
+    assert calculate_scores({"q_0": 32}, bank.questions) == {"Analytical": 1}
+
+
+@pytest.mark.parametrize("option", [3_000_000_000, -(2 ** 31), 2 ** 31])
+def test_options_must_fit_int32(option):
+    with pytest.raises(QuestionBankError, match="32-bit"):
+        QuestionBank([numeric(options=[1, option], correct=1)])
+
+
+def test_multi_keys_must_be_options():
+    q = {"text": " 3, 8, ?", "category": "Analytical", "type": "numeric_choice_multi",
+         "options_1": [1, 2], "options_2": [3, 4], "correct_1": 1, "correct_2": 5}
+    with pytest.raises(QuestionBankError, match="'correct_2'"):
+        QuestionBank([q])
@@ -0,0 +1,20 @@
+import pytest
+
+from scoring_api import ValidationError, validate_answers
+
+QUESTIONS = [
+    {"text": " ?", "category": "Analytical", "type": "numeric_choice", "options": [0, 1, 2], "correct": 1},
+    {"text": " ?", "category": "Analytical", "type": "numeric_choice_multi",
+     "options_1": [0, 1], "options_2": [1, 2], "correct_1": 1, "correct_2": 1},
+]
+
+
+@pytest.mark.parametrize("answers", [{"q_0": True}, {"q_0": False}, {"q_1": [True, 1]}, {"q_1": [1, False]},
+                                     {"q_-1": 1}, {"q_01": 1}, {"q_2": 1}])
+def test_rejects(answers):
+    with pytest.raises(ValidationError):
+        validate_answers(answers, QUESTIONS)
+
+
+def test_accepts_options():
+    assert validate_answers({"q_0": 1, "q_1": [0, 2]}, QUESTIONS) == {"q_0": 1, "q_1": (0, 2)}
@@ -0,0 +1,104 @@
+"""ScoringPlan and RunningTotals must agree with the reference calculate_scores."""
+import random
+
+import pytest
+
+from scoring_plan import ScoringPlan, answer_key
+from utils import QUESTIONS, calculate_scores
+
+CATEGORIES = ["Analytical", "Social", "Moral", "Symbolic", "Creative-Technical"]
+
+
+def random_bank(rng, n):
+    questions = []
+    for i in range(n):
+        cat = rng.choice(CATEGORIES)
+        kind = rng.random()
+        if kind < 0.5:
+            questions.append({"text": f" Statement {i}", "category": cat, "type": "likert"})
+        elif kind < 0.8:
+            options = rng.sample(range(-50, 200), 4)
+            questions.append({"text": f" Sequence {i}", "category": cat, "type": "numeric_choice",
+                              "options": options, "correct": rng.choice(options)})
+        else:
+            options_1, options_2 = rng.sample(range(-50, 200), 4), rng.sample(range(-50, 200), 4)
+            questions.append({"text": f" Sequence {i}", "category": cat, "type": "numeric_choice_multi",
+                              "options_1": options_1, "options_2": options_2,
+                              "correct_1": rng.choice(options_1), "correct_2": rng.choice(options_2)})
+    return questions
+
+
+def random_answer(rng, q):
+    #Mostly valid answers, plus the odd shapes stored answers can take
+    roll = rng.random()
+    if roll < 0.05:
+        return None
+    if roll < 0.1:
+        return rng.choice(["x", "", "3", (1, 2), [1], 2.0])
+    if q["type"] == "likert":
+        return rng.randint(1, 5)
+    if q["type"] == "numeric_choice":
+        value = rng.choice(q["options"])
+        return str(value) if roll < 0.15 else value
+    pair = (rng.choice(q["options_1"]), rng.choice(q["options_2"]))
+    return list(pair) if roll < 0.15 else pair
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_running_totals_match_calculate_scores(seed):
+    rng = random.Random(seed)
+    questions = random_bank(rng, rng.randint(1, 60))
+    plan = ScoringPlan(questions)
+    totals = plan.running_totals()
+    answers = {}
+    #Answer every question, then revisit some, checking after each change
+    events = list(range(len(questions))) + [rng.randrange(len(questions)) for _ in range(len(questions))]
+    for i in events:
+        value = random_answer(rng, questions[i])
+        answers[f"q_{i}"] = value
+        totals.set(i, value)
+        expected = calculate_scores(answers, questions)
+        assert totals.to_dict() == {cat: expected.get(cat, 0) for cat in plan.categories}
+    assert plan.score(answers) == calculate_scores(answers, questions)
+
+
+def reroll(rng, q):
+    #The item a session sees for a generated question: same slot, its own options and key
+    if q["type"] == "numeric_choice":
+        options = rng.sample(range(1000, 2000), 4)
+        return q | {"options": options, "correct": rng.choice(options)}
+    if q["type"] == "numeric_choice_multi":
+        options_1, options_2 = rng.sample(range(1000, 2000), 4), rng.sample(range(1000, 2000), 4)
+        return q | {"options_1": options_1, "options_2": options_2,
+                    "correct_1": rng.choice(options_1), "correct_2": rng.choice(options_2)}
+    return q
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_per_session_keys_override_compiled_keys(seed):
+    rng = random.Random(seed)
+    questions = random_bank(rng, 30)
+    resolved = [reroll(rng, q) for q in questions]
+    plan = ScoringPlan(questions)
+    answers = {f"q_{i}": random_answer(rng, q) for i, q in enumerate(resolved)}
+    totals = plan.running_totals()
+    for i, q in enumerate(resolved):
+        totals.set(i, answers[f"q_{i}"], answer_key(q))
+    expected = calculate_scores(answers, resolved)
+    assert totals.to_dict() == {cat: expected.get(cat, 0) for cat in plan.categories}
+    assert plan.score(answers, [answer_key(q) for q in resolved]) == expected
+
+
+def test_builtin_bank_scores_correct_answers():
+    answers = {f"q_{i}": 5 for i, q in enumerate(QUESTIONS) if q["type"] == "likert"}
+    answers["q_0"] = 32
+    answers["q_2"] = (98, 148)
+    scores = ScoringPlan(QUESTIONS).score(answers)
+    assert scores == calculate_scores(answers, QUESTIONS)
+    assert scores["Analytical"] == 1 + 5 + 2
+
+
+def test_missing_answer_key_scores_zero():
+    questions = [{"text": " Sequence", "category": "Analytical", "type": "numeric_choice", "options": [1, 2]}]
+    assert calculate_scores({"q_0": 1}, questions) == {"Analytical": 0}
+    assert ScoringPlan(questions).score({"q_0": 1}) == {"Analytical": 0}
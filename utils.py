@@ -1,9 +1,20 @@
+import os
 import time
+import struct
+import zlib
+import html
 import streamlit as st
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
 from io import BytesIO
+from functools import lru_cache
+from question_bank import QuestionBank
+from results_store import ResultsStore
+from norms import NormSync, load_table
+from metrics import Metrics
+from session import CompactSession
+from item_generator import FAMILIES, get_pool, load_pools, pick_item
+from email_delivery import EmailQueue
+from scoring_plan import ScoringPlan, answer_key
+from checkpoint import CheckpointStore, DEFAULT_TTL, is_token, new_token, open_backend
 
 #Define the question bank. Each question has: text, category
 QUESTIONS = [
@@ -12,7 +23,9 @@ QUESTIONS = [
         "text": " If a pattern is 2, 4, 8, 16, what comes next?",
         "category": "Analytical",
         "type": "numeric_choice",
-        "options": [32, 34, 36, 40]   # number-only options
+        "generator": "geometric",     # each session gets its own item from the pool
+        "options": [32, 34, 36, 40],  # number-only options
+        "correct": 32
     },
 
     {"text": " I can solve logic puzzles quickly.",
@@ -22,8 +35,11 @@ QUESTIONS = [
         "text": " The series has numbers 3, 8, 18, 35, 61, __, __. Find the missing two.",
         "category": "Analytical",
         "type": "numeric_choice_multi",
-        "options_1": [92, 95, 101, 105],   #first missing number
-        "options_2": [150, 161, 175, 180]  #second missing number
+        "generator": "difference_of_differences",
+        "options_1": [92, 98, 101, 105],   #first missing number
+        "options_2": [148, 161, 175, 180], #second missing number
+        "correct_1": 98,                   #differences 5, 10, 17, 26 grow by 5, 7, 9 -> +37, +50
+        "correct_2": 148
     },
 
     #Social
@@ -55,18 +71,121 @@ DEFAULT_OPTIONS = [
     "Strongly agree"
 ]
 
-#Session initialization
-def init_session_state():
-    if "user" not in st.session_state:
-        st.session_state.user = {}
-    if "answers" not in st.session_state:
-        st.session_state.answers = {}
-    if "progress" not in st.session_state:
-        st.session_state.progress = {"current_q": 0}
-    if "scores" not in st.session_state:
-        st.session_state.scores = {}
-    if "submitted" not in st.session_state:
-        st.session_state.submitted = False
+#Optional external question bank (JSON or SQLite); the built-in QUESTIONS are used when unset
+QUESTION_BANK_PATH = os.environ.get("IQ_QUESTION_BANK", "")
+
+#One parsed bank per process, shared by all sessions; a new mtime evicts the old one
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_question_bank(path, mtime):
+    return QuestionBank.load(path)
+
+@st.cache_resource(show_spinner=False)
+def _builtin_question_bank():
+    return QuestionBank(QUESTIONS)
+
+def get_question_bank(path=None):
+    """
+    path: question bank file (defaults to QUESTION_BANK_PATH)
+    Returns: the process-wide QuestionBank, reloaded only when the file's mtime changes
+    """
+    path = path or QUESTION_BANK_PATH
+    if not path:
+        return _builtin_question_bank()
+    return _load_question_bank(path, os.stat(path).st_mtime_ns)
+
+#Submitted tests are written here by a background thread
+RESULTS_DB_PATH = os.environ.get("IQ_RESULTS_DB", "results.db")
+
+@st.cache_resource(show_spinner=False)
+def get_results_store(path=None):
+    """Returns: the process-wide ResultsStore"""
+    return ResultsStore(path or RESULTS_DB_PATH)
+
+#Serialized norm tables, loaded at startup instead of re-reading every stored result
+NORMS_PATH = os.environ.get("IQ_NORMS", "norms.json")
+#Seconds between folding in results stored by other processes and saving the table
+NORMS_SYNC_INTERVAL = float(os.environ.get("IQ_NORMS_SYNC_INTERVAL", 60))
+
+@st.cache_resource(show_spinner=False)
+def get_norm_table(path=None):
+    """
+    Returns: the process-wide NormTable, loaded from NORMS_PATH (or rebuilt when
+    the file is unreadable); a NormSync thread tops it up with newer stored
+    results and saves it periodically
+    """
+    path = path or NORMS_PATH
+    table = load_table(path)
+    store = get_results_store()
+    NormSync(table, lambda after_id: store.iter_results(after_id=after_id), path, NORMS_SYNC_INTERVAL)
+    return table
+
+#Session initialization: one CompactSession per browser session
+#Session checkpoints for resuming on any replica: a SQLite path, "redis://..." or
+#"memory://"; an empty value turns them off
+CHECKPOINT_URL = os.environ.get("IQ_CHECKPOINTS", "checkpoints.db")
+CHECKPOINT_TTL = float(os.environ.get("IQ_CHECKPOINT_TTL", DEFAULT_TTL))
+
+@st.cache_resource(show_spinner=False)
+def get_checkpoint_store(url=None):
+    """Returns: the process-wide CheckpointStore, or None when checkpoints are off"""
+    url = CHECKPOINT_URL if url is None else url
+    if not url:
+        return None
+    return CheckpointStore(open_backend(url), ttl=CHECKPOINT_TTL)
+
+def _resume_session(n):
+    #Restore the session named by ?resume=<token>, or start one under a new token
+    store = get_checkpoint_store()
+    if store is None:
+        return CompactSession(n)
+    token = st.query_params.get("resume")
+    data = store.load(token) if is_token(token) else None
+    if data is not None:
+        try:
+            session = CompactSession.from_bytes(data)
+        except (ValueError, zlib.error, struct.error):
+            session = None
+        if session is not None:
+            st.session_state.resume_token = token
+            st.session_state.checkpoint_snapshot = data
+            return session
+    st.session_state.resume_token = new_token()
+    st.query_params["resume"] = st.session_state.resume_token
+    return CompactSession(n)
+
+def init_session_state(n_questions=None):
+    """
+    n_questions: answer slots to allocate (defaults to the question bank size)
+    Returns: this session's CompactSession, restored from its checkpoint when
+    the URL carries a resume token
+    """
+    n = len(get_question_bank()) if n_questions is None else n_questions
+    if "session" not in st.session_state:
+        st.session_state.session = _resume_session(n)
+    session = st.session_state.session
+    session.resize(n)
+    if "section_mode" not in st.session_state:
+        st.session_state.section_mode = False
+    if "adaptive_mode" not in st.session_state:
+        st.session_state.adaptive_mode = False
+    if "adaptive" not in st.session_state:
+        st.session_state.adaptive = None
+    return session
+
+def get_session():
+    """Returns: this session's CompactSession (init_session_state must have run)"""
+    return st.session_state.session
+
+def checkpoint_session():
+    """Queue a snapshot of this session if it changed since the last one; never waits on the backend"""
+    store = get_checkpoint_store()
+    token = st.session_state.get("resume_token")
+    if store is None or token is None:
+        return
+    data = get_session().to_bytes()
+    if data != st.session_state.get("checkpoint_snapshot"):
+        st.session_state.checkpoint_snapshot = data
+        store.save(token, data)
 
 #Typing/printing effect: prints line by line with small delay
 def typing_print_lines(lines, delay=0.03):
@@ -84,66 +203,406 @@ def typing_print_lines(lines, delay=0.03):
         #small pause at the end of each line
         time.sleep(0.15)
 
+#Stylesheet for the client-side typing effect; each line is revealed left to right
+TYPING_CSS = """
+<style>
+.iq-typing{margin:0 0 0.5rem 0;clip-path:inset(0 100% 0 0);animation-name:iq-type;animation-fill-mode:forwards;}
+@keyframes iq-type{to{clip-path:inset(0 0 0 0)}}
+</style>
+"""
+
+def typing_html(lines, delay=0.03, line_pause=0.15):
+    """
+    lines: list of strings
+    delay: seconds per character (same pacing as typing_print_lines)
+    line_pause: seconds between the end of one line and the start of the next
+    Returns: HTML string animating the lines in the browser
+    """
+    parts = [TYPING_CSS]
+    start = 0.0
+    for line in lines:
+        duration = max(len(line), 1) * delay
+        parts.append(
+            f"<p class='iq-typing' style='animation-duration:{duration:.2f}s;"
+            f"animation-delay:{start:.2f}s;animation-timing-function:steps({max(len(line), 1)}, end);'>"
+            f"{html.escape(line)}</p>"
+        )
+        start += duration + line_pause
+    return "".join(parts)
+
+#Typing effect rendered by the browser: one markdown delta, no server-side sleeps
+def typing_print_html(lines, delay=0.03):
+    """
+    lines: list of strings
+    delay: seconds per character
+    """
+    st.markdown(typing_html(lines, delay=delay), unsafe_allow_html=True)
+
+#Generated-item pools: loaded from IQ_ITEM_POOLS if set, otherwise built once per process
+ITEM_POOLS_PATH = os.environ.get("IQ_ITEM_POOLS", "")
+ITEM_POOL_SIZE = int(os.environ.get("IQ_ITEM_POOL_SIZE", "200"))
+ITEM_POOL_SEED = int(os.environ.get("IQ_ITEM_POOL_SEED", "0"))
+
+@st.cache_resource(show_spinner=False)
+def get_item_pools():
+    """Returns: {generator family: tuple of prebuilt items}"""
+    if ITEM_POOLS_PATH:
+        return load_pools(ITEM_POOLS_PATH)
+    return {family: get_pool(family, ITEM_POOL_SIZE, ITEM_POOL_SEED) for family in FAMILIES}
+
+def session_question(q, index):
+    """
+    q: question dict from the bank; index: its position
+    Returns: q itself, or this session's pool item when q has a "generator"
+    """
+    family = q.get("generator")
+    if family is None:
+        return q
+    item = pick_item(get_item_pools()[family], get_session().seed, index)
+    return {**item, "category": q["category"], **({"irt": q["irt"]} if "irt" in q else {})}
+
+def session_questions(bank):
+    """Returns: the bank's questions as this session sees them"""
+    return [session_question(q, i) for i, q in enumerate(bank.questions)]
+
+def session_answer_keys(bank):
+    """Returns: {'q_<i>': correct answer} of the keyed items as this session saw them"""
+    keys = {}
+    for i, q in enumerate(session_questions(bank)):
+        key = answer_key(q)
+        if key is not None:
+            keys[f"q_{i}"] = list(key) if isinstance(key, tuple) else key
+    return keys
+
+#Scoring plan compiled once per question bank and shared by every session
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _scoring_plan(source, mtime, _bank):
+    return ScoringPlan(_bank.questions)
+
+def get_running_totals(bank):
+    """Returns: this session's RunningTotals, rebuilt from stored answers when missing or stale"""
+    session = get_session()
+    plan = _scoring_plan(bank.source, bank.mtime, bank)
+    if session.totals is None or session.totals.plan is not plan:
+        totals = plan.running_totals()
+        for i, q in enumerate(session_questions(bank)):
+            value = session.answers.get(f"q_{i}")
+            if value is not None:
+                totals.set(i, value, answer_key(q))
+        session.totals = totals
+    return session.totals
+
+def record_answer(bank, index, q, value):
+    """Store the answer to question `index` (q as this session sees it) and update the running totals"""
+    get_session().answers[f"q_{index}"] = value
+    get_running_totals(bank).set(index, value, answer_key(q))
+
+#Certificate email delivery; disabled unless IQ_SMTP_HOST is set
+@st.cache_resource(show_spinner=False)
+def get_email_queue():
+    """Returns: the process-wide EmailQueue, or None when no SMTP server is configured"""
+    host = os.environ.get("IQ_SMTP_HOST")
+    if not host:
+        return None
+    return EmailQueue(
+        host,
+        port=int(os.environ.get("IQ_SMTP_PORT", "25")),
+        sender=os.environ.get("IQ_SMTP_FROM", "no-reply@localhost"),
+        username=os.environ.get("IQ_SMTP_USER") or None,
+        password=os.environ.get("IQ_SMTP_PASSWORD") or None,
+        starttls=os.environ.get("IQ_SMTP_STARTTLS", "") == "1",
+        workers=int(os.environ.get("IQ_SMTP_WORKERS", "2")),
+    )
+
+def email_certificate(email, name, pdf_bytes):
+    """
+    Queue the certificate for email delivery; returns False when email is not configured
+    Raises: ValueError when email is not a single-line address
+    """
+    if "\r" in email or "\n" in email:
+        raise ValueError("Email address must not contain line breaks.")
+    mailer = get_email_queue()
+    if mailer is None:
+        return False
+    mailer.enqueue(
+        email,
+        "Your IQ Test certificate",
+        f"Hi {name},\n\nThanks for taking the Streamlit IQ Test. Your certificate is attached.\n",
+        attachment=pdf_bytes,
+        filename=f"IQ_Certificate_{'_'.join(name.split())}.pdf",
+    )
+    return True
+
+#Rerun timings; exported only when IQ_METRICS_FILE is set (.jsonl for JSON lines, else Prometheus text)
+@st.cache_resource(show_spinner=False)
+def get_metrics():
+    """Returns: the process-wide Metrics registry"""
+    return Metrics(
+        path=os.environ.get("IQ_METRICS_FILE") or None,
+        interval=float(os.environ.get("IQ_METRICS_INTERVAL", "15")),
+        profile_rate=float(os.environ.get("IQ_PROFILE_RATE", "0")),
+        profile_dir=os.environ.get("IQ_PROFILE_DIR") or None,
+    )
+
+def start_rerun_timer(page):
+    """Returns: the RerunTimer a widget callback already started for this rerun, or a new one"""
+    return st.session_state.pop("rerun_timer", None) or get_metrics().start_rerun(page)
+
+def _callback_timer(page):
+    #Callbacks run before the script body; the rerun they trigger picks this timer up
+    if st.session_state.get("rerun_timer") is None:
+        st.session_state.rerun_timer = get_metrics().start_rerun(page)
+    return st.session_state.rerun_timer
+
+#Adaptive testing: a category stops once its ability standard error drops to this target
+ADAPTIVE_SE_TARGET = float(os.environ.get("IQ_ADAPTIVE_SE", "0.5"))
+
+#Item parameters and information tables, built once per question bank (numpy is loaded on first use)
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _item_pool(source, mtime, _bank):
+    from adaptive import ItemPool
+
+    return ItemPool(_bank.questions)
+
+def get_adaptive_session(bank):
+    """
+    Returns: this session's AdaptiveSession. On first use it jumps
+    progress["current_q"] to its first item, unless the session already has
+    answers (resumed from a checkpoint): then the posterior is rebuilt from
+    them and the current question is kept
+    """
+    if st.session_state.adaptive is None:
+        from adaptive import AdaptiveSession, item_response
+
+        pool = _item_pool(bank.source, bank.mtime, bank)
+        adaptive = AdaptiveSession(pool, se_target=ADAPTIVE_SE_TARGET)
+        session = get_session()
+        #The current question's answer is recorded when the user moves on, not here
+        answered = [
+            i for i in range(len(bank))
+            if i != session.current_q and session.answers.get(f"q_{i}") is not None
+        ]
+        for i in answered:
+            adaptive.record(i, item_response(session_question(bank[i], i), session.answers[f"q_{i}"]))
+        if not answered:
+            first = adaptive.next_item()
+            session.current_q = first if first is not None else 0
+        st.session_state.adaptive = adaptive
+    return st.session_state.adaptive
+
+def reset_adaptive_session():
+    #Toggling adaptive mode mid-test: the next adaptive rerun rebuilds from the answers so far
+    st.session_state.adaptive = None
+
+def adaptive_next_item(adaptive, q, q_index, answer):
+    """Record the answer to question q_index; Returns: the next item index, or None when done"""
+    from adaptive import item_response
+
+    adaptive.record(q_index, item_response(q, answer))
+    return adaptive.next_item()
+
+#Answer widgets, shared by the one-question and the section layouts of the Test page
+def answer_widget_keys(q, answer_key, key_prefix=""):
+    """Returns: session_state keys of the radios that answer q"""
+    if q["type"] == "numeric_choice_multi":
+        return [f"{key_prefix}{answer_key}_1", f"{key_prefix}{answer_key}_2"]
+    return [f"{key_prefix}{answer_key}_radio"]
+
+def _option_index(options, prev, default):
+    prev = None if prev is None else str(prev)
+    return options.index(prev) if prev in options else default
+
+def render_answer_widgets(q, answer_key, key_prefix=""):
+    """
+    q: question dict
+    answer_key: 'q_<index>' key of the stored answer, used to preselect it
+    Returns: list of selected option labels (two for numeric_choice_multi)
+    """
+    keys = answer_widget_keys(q, answer_key, key_prefix)
+    prev_answer = get_session().answers.get(answer_key, None)
+
+    if q["type"] == "likert":
+        index = prev_answer - 1 if isinstance(prev_answer, int) and 1 <= prev_answer <= len(DEFAULT_OPTIONS) else 2
+        return [st.radio("Your answer:", DEFAULT_OPTIONS, index=index, key=keys[0])]
+
+    if q["type"] == "numeric_choice":
+        options = [str(opt) for opt in q["options"]]
+        return [st.radio("Choose the correct number:", options, index=_option_index(options, prev_answer, 0), key=keys[0])]
+
+    options1 = [str(o) for o in q["options_1"]]
+    options2 = [str(o) for o in q["options_2"]]
+    prev1, prev2 = prev_answer if isinstance(prev_answer, (tuple, list)) else (None, None)
+    col1, col2 = st.columns(2)
+    with col1:
+        ans1 = st.radio("First missing number:", options1, index=_option_index(options1, prev1, 0), key=keys[0])
+    with col2:
+        ans2 = st.radio("Second missing number:", options2, index=_option_index(options2, prev2, 0), key=keys[1])
+    return [ans1, ans2]
+
+def answer_from_selection(q, selected):
+    """
+    q: question dict
+    selected: option labels from render_answer_widgets
+    Returns: the value stored in answers for q
+    """
+    if q["type"] == "likert":
+        # Convert to score 1–5
+        return DEFAULT_OPTIONS.index(selected[0]) + 1
+    if q["type"] == "numeric_choice":
+        # Store the chosen option; scoring compares it with the answer key
+        return q["options"][[str(o) for o in q["options"]].index(selected[0])]
+    # Store the chosen pair of options
+    return (
+        q["options_1"][[str(o) for o in q["options_1"]].index(selected[0])],
+        q["options_2"][[str(o) for o in q["options_2"]].index(selected[1])],
+    )
+
+#Form callback for section mode: store the section's answers, then move by step
+def commit_section(bank, section, step):
+    session = get_session()
+    timer = _callback_timer("Test")
+    indexes = bank.by_category[bank.categories[section]]
+    with timer.phase("section_commit"):
+        for i in indexes:
+            q = session_question(bank[i], i)
+            selected = [st.session_state[k] for k in answer_widget_keys(q, f"q_{i}", "section_")]
+            record_answer(bank, i, q, answer_from_selection(q, selected))
+
+    last = len(bank.categories) - 1
+    if step > 0 and section == last:
+        with timer.phase("submit"):
+            finish_test(bank)
+    else:
+        session.current_section = min(max(section + step, 0), last)
+
+#Score the test and queue it for the results store and norm tables (first submit only)
+def finish_test(bank, adaptive=None):
+    """adaptive: the run's AdaptiveSession, when it was an adaptive test"""
+    session = get_session()
+    already_submitted = session.submitted
+    session.submitted = True
+    #Totals were kept current answer by answer; nothing is re-scored here
+    session.scores = get_running_totals(bank).to_dict()
+    session.abilities = None
+    if adaptive is not None:
+        #Only the asked items were answered: report scores scaled to the full test
+        #length next to the ability estimates, and keep them out of the norms
+        session.scores = adaptive.full_length_scores(session.scores)
+        session.abilities = {cat: [round(theta, 3), round(se, 3)] for cat, (theta, se) in adaptive.abilities().items()}
+    #Queue the result for the background writer; never blocks on disk
+    if not already_submitted:
+        norms = get_norm_table()
+        submitted_at = time.time()
+        get_results_store().submit(
+            session.user,
+            dict(session.answers),
+            session.scores,
+            started_at=session.started_at,
+            submitted_at=submitted_at,
+            answer_keys=session_answer_keys(bank),
+            abilities=session.abilities,
+        )
+        if adaptive is None:
+            norms.add(session.scores, submitted_at)
+
 #Score calculation: aggregate answers by category
 def calculate_scores(answers, questions):
     """
     answers: dict { 'q_0': answer_value, 'q_1': answer_value, ... }
     questions: list of question dicts
     Returns: dict {category: total_score}
+    Likert answers count their 1-5 value; numeric items score 1 for the correct
+    option, and multi-part items 1 per correct part. This is the reference
+    implementation; the Test page uses ScoringPlan running totals.
     """
     cat_scores = {}
 
     for i, q in enumerate(questions):
-        q_key = f"q_{i}"
-        score = answers.get(q_key, 0)
-
-        # Convert types safely
-        if isinstance(score, tuple):
-            # Multi-part numeric: sum of correct parts
-            score = sum(int(s) for s in score if str(s).isdigit())
-        elif isinstance(score, str):
-            # Likert or numeric-choice: try convert to int
+        value = answers.get(f"q_{i}")
+        score = 0
+
+        if value is None:
+            score = 0
+        elif q["type"] == "likert":
+            # Likert: the stored 1-5 value
             try:
-                score = int(score)
-            except ValueError:
+                score = int(value)
+            except (TypeError, ValueError):
                 score = 0
-        elif score is None:
-            score = 0
+        elif q["type"] == "numeric_choice":
+            score = 1 if _same_number(value, q.get("correct")) else 0
+        elif isinstance(value, (tuple, list)) and len(value) == 2:
+            # Multi-part numeric: one point per correct part
+            score = int(_same_number(value[0], q.get("correct_1"))) + int(_same_number(value[1], q.get("correct_2")))
 
         cat = q["category"]
         cat_scores[cat] = cat_scores.get(cat, 0) + score
 
     return cat_scores
 
-#Generate a PDF certificate and return bytes(using reportlab)
-#def generate_certificate_bytes(name: str, scores: dict):
-#buffer = BytesIO()
-def generate_certificate_bytes(name: str, scores: dict):
+def _same_number(value, correct):
+    try:
+        return float(value) == float(correct)
+    except (TypeError, ValueError):
+        return False
+
+#Certificate rendering keeps the last CERTIFICATE_CACHE_SIZE PDFs per process
+CERTIFICATE_CACHE_SIZE = 256
+
+#Static certificate lines: (font, size, offset from the top of the page in inches, text)
+CERTIFICATE_TEMPLATE_LINES = (
+    ("Helvetica-Bold", 24, 1.5, "Certificate of Assessment"),
+    ("Helvetica", 14, 1.9, "Awarded to"),
+    ("Helvetica", 12, 2.8, "Tested with Streamlit IQ Test App"),
+)
+
+#Layout of the static lines, measured once per process
+@lru_cache(maxsize=None)
+def _certificate_template():
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    width, height = letter
+    return tuple(
+        (font, size, (width - stringWidth(text, font, size)) / 2, height - offset * inch, text)
+        for font, size, offset, text in CERTIFICATE_TEMPLATE_LINES
+    )
+
+@lru_cache(maxsize=CERTIFICATE_CACHE_SIZE)
+def _render_certificate(name, score_items):
+    #reportlab is only needed on the Results page, so it is imported on first use
     from reportlab.pdfgen import canvas
     from reportlab.lib.pagesizes import letter
-    from io import BytesIO
+    from reportlab.lib.units import inch
 
     buffer = BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
     width, height = letter
 
-    #Certificate content
-    c.setFont("Helvetica-Bold", 24)
-    c.drawCentredString(width / 2, height - 1.5 * 72, "Certificate of Assessment")
-    c.setFont("Helvetica", 14)
-    c.drawCentredString(width / 2, height - 1.9 * 72, "Awarded to")
+    #Certificate content; the static lines are placed from the cached layout
+    for font, size, x, y, text in _certificate_template():
+        c.setFont(font, size)
+        c.drawString(x, y, text)
     c.setFont("Helvetica-Bold", 20)
-    c.drawCentredString(width / 2, height - 2.4 * 72, name)
-    c.setFont("Helvetica", 12)
-    c.drawCentredString(width / 2, height - 2.8 * 72, "Tested with Streamlit IQ Test App")
+    c.drawCentredString(width / 2, height - 2.4 * inch, name)
 
     #Draw scores
-    y = height - 3.4 * 72
-    for cat, val in scores.items():
-        c.drawString(72, y, f"{cat}: {val:.2f} / 5")
-        y -= 0.3 * 72
+    c.setFont("Helvetica", 12)
+    y = height - 3.4 * inch
+    for cat, val in score_items:
+        c.drawString(inch, y, f"{cat}: {val:.2f} / 5")
+        y -= 0.3 * inch
 
     c.showPage()
     c.save()
-    buffer.seek(0)
-    return buffer.getvalue()  #Make sure to return bytes
\ No newline at end of file
+    return buffer.getvalue()
+
+#Generate a PDF certificate and return bytes(using reportlab)
+def generate_certificate_bytes(name: str, scores: dict):
+    """
+    name: name printed on the certificate
+    scores: dict {category: score}
+    Returns: PDF bytes; repeated calls with the same name and scores hit the cache
+    """
+    return _render_certificate(name, tuple(scores.items()))